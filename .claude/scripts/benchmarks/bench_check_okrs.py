@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Benchmark the OKR stop hook as results/shared.md grows.
+
+Grows a scratch shared.md in steps. After each step one more AGENT STATUS
+block is appended and a stop-hook check is timed, once with the incremental
+index and once with a forced full rescan. Incremental latency should stay flat while the
+full rescan grows with the file.
+
+    python .claude/scripts/benchmarks/bench_check_okrs.py --steps 10 --blocks-per-step 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import check_okrs  # noqa: E402
+
+
+def status_block(n: int) -> str:
+    return (
+        f"## AGENT STATUS: role-{n} - COMPLETED\n"
+        f"**Timestamp**: 2026-01-01 00:00:00\n"
+        f"**Status**: completed\n\n"
+        f"### Key Results:\n"
+        f"1. [Produce artifact {n}]: ACHIEVED\n"
+        f"2. [Validate artifact {n}]: ACHIEVED\n\n"
+        f"Notes: {'lorem ipsum ' * 20}\n\n"
+    )
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--blocks-per-step", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        shared = Path(tmp) / "shared.md"
+        shared.write_text("# Shared Results\n\n", encoding="utf-8")
+        check_okrs.check(shared)
+
+        print(f"{'size (MB)':>10} {'incremental (ms)':>17} {'full rescan (ms)':>17}")
+        n = 0
+        for _ in range(args.steps):
+            with open(shared, "a", encoding="utf-8") as fh:
+                for _ in range(args.blocks_per_step):
+                    fh.write(status_block(n))
+                    n += 1
+            check_okrs.check(shared)
+            # Per-invocation cost an agent stop pays: one new status block, then a check.
+            with open(shared, "a", encoding="utf-8") as fh:
+                fh.write(status_block(n))
+                n += 1
+            start = time.perf_counter()
+            check_okrs.check(shared)
+            incremental = time.perf_counter() - start
+            full = timed(lambda: check_okrs.check(shared, full=True), args.repeat)
+            size_mb = shared.stat().st_size / 1e6
+            print(f"{size_mb:>10.2f} {incremental * 1e3:>17.2f} {full * 1e3:>17.2f}")
+
+        idle = timed(lambda: check_okrs.check(shared), args.repeat)
+        print(f"\nno-change check at {shared.stat().st_size / 1e6:.2f} MB: {idle * 1e3:.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
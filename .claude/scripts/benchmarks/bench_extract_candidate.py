@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Benchmark PDF text extraction over a generated corpus.
+
+Writes ``--docs`` PDFs of ``--pages`` pages each (every tenth page has no
+text layer, like a scanned page) and times a cold extraction with an
+empty cache for 1 and N workers, then a warm re-run that must be served
+entirely from the SHA-256 cache. OCR is on, as in the CLI; without
+paddleocr installed the numbers reflect the text-layer path.
+
+    python .claude/scripts/benchmarks/bench_extract_candidate.py --docs 20 --pages 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from extract_candidate import Extractor, ocr_available  # noqa: E402
+
+
+def write_pdf(path: Path, pages: int, doc_id: int) -> None:
+    """Write a minimal multi-page PDF with Helvetica text lines."""
+    objects: list[bytes] = []
+    page_ids = []
+    font_id = 3
+    objects.append(b"")  # 1: catalog, filled below
+    objects.append(b"")  # 2: pages, filled below
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for p in range(pages):
+        if p % 10 == 9:
+            stream = b"0.8 g 72 72 450 650 re f"  # drawing only, no text layer
+        else:
+            lines = [f"Candidate {doc_id} page {p + 1} line {i}: experience with Python and SQL" for i in range(40)]
+            ops = ["BT /F1 10 Tf 12 TL 72 760 Td"] + [f"({line}) Tj T*" for line in lines] + ["ET"]
+            stream = "\n".join(ops).encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (content_id, font_id)
+        )
+        page_ids.append(len(objects))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+def run(files: list[Path], workers: int, cache_dir: Path) -> tuple[float, int, int, int]:
+    start = time.perf_counter()
+    pages = needs_ocr = cached = 0
+    # OCR on, as in the CLI default; without paddleocr, scanned pages stay flagged.
+    with Extractor(workers, ocr=True, cache_dir=cache_dir) as extractor:
+        for path in files:
+            result = extractor.extract(path)
+            pages += result["page_count"]
+            needs_ocr += len(result["needs_ocr_pages"])
+            cached += result["cached"]
+    return time.perf_counter() - start, pages, needs_ocr, cached
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=40)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        files = []
+        for i in range(args.docs):
+            files.append(tmp / f"cv-{i}.pdf")
+            write_pdf(files[-1], args.pages, i)
+        size_mb = sum(f.stat().st_size for f in files) / 1e6
+        print(f"corpus: {args.docs} PDFs, {args.docs * args.pages} pages, {size_mb:.1f} MB")
+
+        for workers in sorted({1, os.cpu_count() or 1}):
+            cache_dir = tmp / f"cache-{workers}"
+            elapsed, pages, needs_ocr, _ = run(files, workers, cache_dir)
+            print(f"  cold, {workers} worker(s): {elapsed:6.2f}s  {pages / elapsed:8.0f} pages/s "
+                  f"({needs_ocr} pages flagged for OCR)")
+            elapsed, pages, needs_ocr_warm, cached = run(files, workers, cache_dir)
+            if needs_ocr_warm and ocr_available():
+                print(f"  warm, {workers} worker(s): {elapsed:6.2f}s  ({cached}/{args.docs} from cache; "
+                      "pages flagged for OCR are retried with paddleocr)")
+                continue
+            if cached != args.docs:
+                print(f"FAIL: warm run took {cached}/{args.docs} documents from cache")
+                return 1
+            print(f"  warm, {workers} worker(s): {elapsed:6.2f}s  (all {args.docs} documents from cache)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
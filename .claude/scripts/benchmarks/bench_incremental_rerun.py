@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Check that re-running a workflow after a one-role edit only re-runs its subgraph.
+
+Generates a layered workflow of ``--roles`` roles, each reading one or two
+results of the previous layer and writing its own ``results/<role>.txt``.
+It runs the workflow once, re-runs it unchanged, then edits one role and
+re-runs it again. The third run must execute exactly that role and its
+descendants. Exits non-zero otherwise, and prints the time of each run.
+
+    python .claude/scripts/benchmarks/bench_incremental_rerun.py --roles 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from run_manifest import IncrementalRun, RunManifest  # noqa: E402
+from scheduler import DependencyGraph, run  # noqa: E402
+from workflow_model import Workflow  # noqa: E402
+
+
+def make_workflow(roles: int, width: int, rng: random.Random) -> dict:
+    people = []
+    for i in range(roles):
+        layer = i // width
+        inputs = ["templates/brief.md"]
+        if layer:
+            previous = range((layer - 1) * width, layer * width)
+            inputs = [f"results/role-{j}.txt" for j in rng.sample(previous, min(2, width))]
+        people.append({
+            "role": f"role-{i}",
+            "description": f"step {i}",
+            "inputs_outputs": [{"inputs": inputs}, {"outputs": [f"results/role-{i}.txt"]}],
+        })
+    return {"name": "incremental", "people_involved": people}
+
+
+def execute(workflow_data: dict, root: Path, workers: int) -> tuple[list[str], float]:
+    workflow = Workflow.model_validate(workflow_data)
+    graph = DependencyGraph.from_workflow(workflow)
+    definitions = {r.role: r.description for r in workflow.people_involved}
+    incremental = IncrementalRun(
+        workflow, {n: node.deps for n, node in graph.nodes.items()},
+        RunManifest(root / "results" / ".runs" / "bench.json"), root=root,
+    )
+    incremental.begin("bench.yaml")
+
+    def run_role(name: str) -> None:
+        (root / "results" / f"{name}.txt").write_text(f"{name}: {definitions[name]}\n", encoding="utf-8")
+
+    start = time.perf_counter()
+    run(graph, run_role, workers, on_event=incremental.on_event, skip=incremental.should_skip)
+    incremental.finish(ok=True)
+    return incremental.executed, time.perf_counter() - start
+
+
+def descendants(graph: DependencyGraph, name: str) -> set[str]:
+    found, stack = {name}, [name]
+    while stack:
+        for child in graph.nodes[stack.pop()].dependents:
+            if child not in found:
+                found.add(child)
+                stack.append(child)
+    return found
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--roles", type=int, default=300)
+    parser.add_argument("--width", type=int, default=10, help="roles per layer")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(7)
+    data = make_workflow(args.roles, args.width, rng)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "templates").mkdir()
+        (root / "results").mkdir()
+        (root / "templates" / "brief.md").write_text("brief\n", encoding="utf-8")
+
+        executed, elapsed = execute(data, root, args.workers)
+        print(f"full run:      {len(executed):4d} roles executed in {elapsed:.2f}s")
+        executed, elapsed = execute(data, root, args.workers)
+        print(f"unchanged run: {len(executed):4d} roles executed in {elapsed:.2f}s")
+        ok = not executed
+
+        edited = f"role-{args.roles // 2}"
+        next(r for r in data["people_involved"] if r["role"] == edited)["description"] = "edited"
+        expected = descendants(DependencyGraph.from_workflow(Workflow.model_validate(data)), edited)
+        executed, elapsed = execute(data, root, args.workers)
+        print(f"edit {edited}: {len(executed):4d} roles executed in {elapsed:.2f}s "
+              f"(affected subgraph: {len(expected)} roles)")
+        ok = ok and set(executed) == expected and len(executed) == len(expected)
+
+    print("OK: only the edited role and its descendants re-ran" if ok else "FAIL: unexpected roles re-ran")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
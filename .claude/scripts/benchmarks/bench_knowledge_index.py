@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Benchmark knowledge index builds and query latency on a synthetic corpus.
+
+Generates ``--docs`` markdown documents from a fixed vocabulary (Zipf-like
+word frequencies, a few topic words per document), then times a cold
+build, a no-op rebuild, a rebuild after editing ``--edits`` files, and
+``--queries`` BM25 queries (p50/p95).
+
+    python .claude/scripts/benchmarks/bench_knowledge_index.py --docs 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from knowledge_index import KnowledgeIndex  # noqa: E402
+
+
+def make_corpus(root: Path, docs: int, words_per_doc: int, rng: random.Random) -> list[str]:
+    vocab = [f"term{i}" for i in range(20_000)]
+    weights = [1 / (i + 1) for i in range(len(vocab))]
+    topics = [f"topic{i}" for i in range(500)]
+    for d in range(docs):
+        doc_topics = rng.sample(topics, 3)
+        paragraphs = []
+        for _ in range(words_per_doc // 60):
+            words = rng.choices(vocab, weights, k=55) + rng.choices(doc_topics, k=5)
+            rng.shuffle(words)
+            paragraphs.append(" ".join(words))
+        path = root / f"area-{d % 20}" / f"doc-{d}.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"# Document {d}\n\n" + "\n\n".join(paragraphs), encoding="utf-8")
+    return topics
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=3000)
+    parser.add_argument("--words", type=int, default=600, help="words per document")
+    parser.add_argument("--edits", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "domain knowledge"
+        topics = make_corpus(source, args.docs, args.words, rng)
+        with KnowledgeIndex(source, Path(tmp) / "index.db") as index:
+            s = index.build()
+            print(f"cold build:   {s.seconds:7.2f}s  ({s.indexed} docs, {s.chunks} chunks)")
+            s = index.build()
+            print(f"no-op build:  {s.seconds:7.2f}s  ({s.unchanged} unchanged)")
+            for path in rng.sample(sorted(source.rglob("*.md")), args.edits):
+                path.write_text(path.read_text(encoding="utf-8") + "\n\nappended topic0 note\n", encoding="utf-8")
+            s = index.build()
+            print(f"edit build:   {s.seconds:7.2f}s  ({s.indexed} re-indexed)")
+
+            latencies = []
+            for _ in range(args.queries):
+                query = " ".join(rng.sample(topics, 2) + [f"term{rng.randrange(2000)}"])
+                start = time.perf_counter()
+                index.search(query, k=5)
+                latencies.append((time.perf_counter() - start) * 1e3)
+            latencies.sort()
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            print(f"query:        p50 {statistics.median(latencies):.2f} ms, p95 {p95:.2f} ms "
+                  f"over {args.queries} queries")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Benchmark batch CV rendering throughput.
+
+Builds a docxtpl template shaped like a CV (header fields, experience and
+education loops, skills list) and ``--records`` synthetic candidates in a
+JSONL file, then reports CVs/second for 1, 4 and N worker processes, plus
+the uncached one-DocxTemplate-per-CV baseline. First checks that a record
+failing partway through a render does not leak into the next record.
+
+    python .claude/scripts/benchmarks/bench_render_cv.py --records 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from docx import Document
+from docxtpl import DocxTemplate
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import render_cv  # noqa: E402
+
+
+def make_template(path: Path) -> None:
+    doc = Document()
+    doc.add_heading("{{ name }}", level=0)
+    doc.add_paragraph("{{ title }} | {{ email }} | {{ phone }}")
+    doc.add_heading("Profile", level=1)
+    doc.add_paragraph("{{ summary }}")
+    doc.add_heading("Experience", level=1)
+    doc.add_paragraph("{%p for job in experience %}")
+    doc.add_paragraph("{{ job.role }} at {{ job.company }} ({{ job.start }} - {{ job.end }})")
+    doc.add_paragraph("{%p for item in job.highlights %}")
+    doc.add_paragraph("- {{ item }}")
+    doc.add_paragraph("{%p endfor %}")
+    doc.add_paragraph("{%p endfor %}")
+    doc.add_heading("Education", level=1)
+    doc.add_paragraph("{%p for ed in education %}")
+    doc.add_paragraph("{{ ed.degree }}, {{ ed.school }} ({{ ed.year }})")
+    doc.add_paragraph("{%p endfor %}")
+    doc.add_heading("Skills", level=1)
+    doc.add_paragraph("{{ skills | join(', ') }}")
+    doc.save(path)
+
+
+def candidate(i: int) -> dict:
+    return {
+        "id": f"candidate-{i}",
+        "name": f"Candidate {i}",
+        "title": "Engineer",
+        "email": f"c{i}@example.com",
+        "phone": "+00 000 000",
+        "summary": "Experienced engineer. " * 10,
+        "experience": [
+            {
+                "role": f"Role {j}",
+                "company": f"Company {j}",
+                "start": 2010 + j,
+                "end": 2011 + j,
+                "highlights": [f"Delivered project {k}" for k in range(4)],
+            }
+            for j in range(5)
+        ],
+        "education": [{"degree": "MSc", "school": "University", "year": 2009}],
+        "skills": ["Python", "SQL", "Docker", "Jinja2"],
+    }
+
+
+def check_isolation(tmp: Path) -> None:
+    """A render failing in the header must not leave its body in the next CV."""
+    template = tmp / "isolation.docx"
+    doc = Document()
+    doc.add_paragraph("Name: {{ name }}")
+    doc.sections[0].header.paragraphs[0].text = "{{ company.title }}"
+    doc.save(template)
+
+    jsonl = tmp / "isolation.jsonl"
+    records = [{"id": "alice", "name": "Alice"}, {"id": "bob", "name": "Bob", "company": {"title": "ACME"}}]
+    jsonl.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+    summary = render_cv.run_batch(str(jsonl), tmp / "isolation", template, workers=1)
+    assert [f["record_id"] for f in summary["failures"]] == ["alice"], summary["failures"]
+    body = "\n".join(p.text for p in Document(tmp / "isolation" / "bob.docx").paragraphs)
+    assert body == "Name: Bob", f"failed record leaked into the next CV: {body!r}"
+    print("OK: a failed record does not affect the next one")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, 4, cpus})
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        template = tmp / "template.docx"
+        check_isolation(tmp)
+        make_template(template)
+        jsonl = tmp / "candidates.jsonl"
+        with open(jsonl, "w", encoding="utf-8") as fh:
+            for i in range(args.records):
+                fh.write(json.dumps(candidate(i)) + "\n")
+
+        n = min(args.records, 50)
+        start = time.perf_counter()
+        for i in range(n):
+            tpl = DocxTemplate(template)
+            tpl.render(candidate(i))
+            tpl.save(tmp / "baseline.docx")
+        print(f"{'uncached, 1 worker':>22}: {n / (time.perf_counter() - start):8.1f} CVs/s")
+
+        for workers in worker_counts:
+            summary = render_cv.run_batch(str(jsonl), tmp / f"out-{workers}", template, workers)
+            assert summary["failed"] == 0, summary["failures"][:3]
+            print(f"{f'batch, {workers} workers':>22}: {summary['cvs_per_second']:8.1f} CVs/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Check that disabled tracing costs (almost) nothing.
+
+Times ``with span(...)`` and ``count(...)`` while tracing is disabled and
+compares them with the floor for the same call shape: a ``with`` over a
+function that immediately returns a no-op context manager. Also times
+enabled spans writing to a scratch file, for reference. Exits non-zero if a
+disabled call costs more than ``--max-ratio`` times that floor, so the
+check holds on slow and fast machines alike.
+
+    python .claude/scripts/benchmarks/bench_tracing.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import tracing  # noqa: E402
+from tracing import count, span  # noqa: E402
+
+
+def per_call_ns(fn, n: int, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        fn(n)
+        best = min(best, time.perf_counter_ns() - start)
+    return best / n
+
+
+def baseline(n: int) -> None:
+    for i in range(n):
+        pass
+
+
+class _Noop:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+
+_NOOP = _Noop()
+
+
+def noop_span(name, role=None, **attrs):
+    return _NOOP
+
+
+def noop_count(name, value=1, role=None, **attrs):
+    return None
+
+
+def floor_span(n: int) -> None:
+    for i in range(n):
+        with noop_span("bench.step", role="r", i=i):
+            pass
+
+
+def floor_count(n: int) -> None:
+    for i in range(n):
+        noop_count("bench.counter", 1, role="r")
+
+
+def with_span(n: int) -> None:
+    for i in range(n):
+        with span("bench.step", role="r", i=i):
+            pass
+
+
+def with_count(n: int) -> None:
+    for i in range(n):
+        count("bench.counter", 1, role="r")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=200_000)
+    parser.add_argument("--max-ratio", type=float, default=1.3,
+                        help="fail if a disabled call costs more than this times the no-op floor")
+    args = parser.parse_args(argv)
+
+    tracing.disable()
+    base = per_call_ns(baseline, args.n)
+    span_floor = per_call_ns(floor_span, args.n) - base
+    count_floor = per_call_ns(floor_count, args.n) - base
+    span_off = per_call_ns(with_span, args.n) - base
+    count_off = per_call_ns(with_count, args.n) - base
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tracing.enable(Path(tmp) / "trace.jsonl")
+        n_on = max(1, args.n // 20)
+        span_on = per_call_ns(with_span, n_on, repeat=1) - base
+        tracing.disable()
+
+    print(f"span, disabled : {span_off:8.1f} ns/call (no-op floor {span_floor:.1f})")
+    print(f"count, disabled: {count_off:8.1f} ns/call (no-op floor {count_floor:.1f})")
+    print(f"span, enabled  : {span_on:8.1f} ns/call (one JSONL line per span)")
+    ratio = max(span_off / span_floor, count_off / count_floor)
+    if ratio > args.max_ratio:
+        print(f"FAIL: disabled tracing costs {ratio:.2f}x the no-op floor (limit {args.max_ratio:g}x)")
+        return 1
+    print(f"OK: disabled tracing costs {ratio:.2f}x the no-op floor")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Benchmark cold vs warm workflow loads.
+
+Generates a workflow with ``--roles`` roles shaped like
+workflows/workflow-template.yaml and times three paths: PyYAML's pure
+Python SafeLoader plus validation, the libyaml loader plus validation
+(cold, cache miss), and a warm load from the validated-model cache.
+
+    python .claude/scripts/benchmarks/bench_workflow_load.py --roles 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import workflow_model  # noqa: E402
+
+
+def make_workflow(roles: int) -> dict:
+    people = []
+    for i in range(roles):
+        people.append({
+            "role": f"role-{i}",
+            "description": f"Role number {i}",
+            "tools": [{"name": t, "purpose": f"{t} for role {i}"} for t in ("Read", "Write", "Bash")],
+            "skills": [{"name": "docx", "purpose": "write the report"}],
+            "knowledge_sources": [
+                {"name": f"source-{i}", "purpose": "reference", "path": f"domain knowledge/doc-{i}.md"}
+            ],
+            "inputs_outputs": [
+                {"inputs": [f"artifact-{i - 1}"] if i else ["brief"]},
+                {"outputs": [f"artifact-{i}"]},
+            ],
+            "preconditions": [
+                {"name": f"gate-{i}", "description": "input exists", "verification": f"test -f results/artifact-{i - 1}"}
+            ],
+            "okr": {
+                "objectives": [f"Deliver artifact {i}"],
+                "key_results": [
+                    {"result": f"artifact-{i} written", "validation": ["file exists", "file is not empty"]},
+                    {"result": f"artifact-{i} reviewed", "validation": ["review noted in shared.md"]},
+                ],
+            },
+        })
+    return {"name": "benchmark", "overview": "synthetic workflow", "people_involved": people}
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--roles", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "workflow.yaml"
+        path.write_text(yaml.safe_dump(make_workflow(args.roles), sort_keys=False), encoding="utf-8")
+        cache_dir = Path(tmp) / "cache"
+
+        def pure_python():
+            data = yaml.load(path.read_bytes(), Loader=yaml.SafeLoader)
+            workflow_model.Workflow.model_validate(data)
+
+        def cold():
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            workflow_model.load_workflow(path, cache_dir=cache_dir)
+
+        workflow_model.load_workflow(path, cache_dir=cache_dir)
+
+        def warm():
+            workflow_model.load_workflow(path, cache_dir=cache_dir)
+
+        size_kb = path.stat().st_size / 1024
+        print(f"{args.roles} roles, {size_kb:.0f} KB of YAML "
+              f"(libyaml: {'yes' if workflow_model.YamlLoader is not yaml.SafeLoader else 'no'})")
+        print(f"  SafeLoader + validate : {best_of(pure_python, args.repeat) * 1e3:8.2f} ms")
+        print(f"  cold load (cache miss): {best_of(cold, args.repeat) * 1e3:8.2f} ms")
+        print(f"  warm load (cache hit) : {best_of(warm, args.repeat) * 1e3:8.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
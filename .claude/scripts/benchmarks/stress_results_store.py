@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Stress the results store with many concurrent writer processes.
+
+Each writer process records ``--records`` reports for its own role, each
+carrying key results and a large notes payload with an embedded checksum.
+Afterwards every report is read back and checked: none missing, none
+duplicated, every payload intact, and the latest key result per role equal
+to the last one that writer recorded. Exits non-zero on any violation.
+
+    python .claude/scripts/benchmarks/stress_results_store.py --writers 32 --records 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from results_store import ResultsStore  # noqa: E402
+
+
+def payload(writer: int, seq: int, size: int) -> str:
+    body = (f"w{writer}-r{seq}-" * (size // 8 + 1))[:size]
+    return f"{seq}:{hashlib.sha256(body.encode()).hexdigest()}:{body}"
+
+
+def writer(db_path: str, writer_id: int, records: int, size: int) -> None:
+    with ResultsStore(db_path) as store:
+        for seq in range(records):
+            last = seq == records - 1
+            store.record(
+                role=f"role-{writer_id}",
+                state="COMPLETED" if last else "PARTIAL",
+                status="completed" if last else "partial",
+                key_results=[(f"kr-{writer_id}", "ACHIEVED" if last else "PENDING")],
+                notes=payload(writer_id, seq, size),
+            )
+
+
+def verify(db_path: str, writers: int, records: int) -> list[str]:
+    errors = []
+    with ResultsStore(db_path) as store:
+        reports = store.reports()
+        seen: dict[str, list[int]] = {}
+        for report in reports:
+            seq, _, rest = report.notes.partition(":")
+            digest, _, body = rest.partition(":")
+            if hashlib.sha256(body.encode()).hexdigest() != digest:
+                errors.append(f"torn payload in report {report.id} ({report.role})")
+            seen.setdefault(report.role, []).append(int(seq))
+        for w in range(writers):
+            seqs = seen.get(f"role-{w}", [])
+            if sorted(seqs) != list(range(records)):
+                errors.append(f"role-{w}: expected {records} records, got {len(seqs)} ({len(set(seqs))} unique)")
+            elif seqs != sorted(seqs):
+                errors.append(f"role-{w}: records out of order")
+        if len(reports) != writers * records:
+            errors.append(f"expected {writers * records} reports, found {len(reports)}")
+        if store.pending_key_results():
+            errors.append(f"{len(store.pending_key_results())} key results still pending")
+    return errors
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=32)
+    parser.add_argument("--records", type=int, default=200)
+    parser.add_argument("--payload-bytes", type=int, default=16_384)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "results.db")
+        ResultsStore(db_path).close()
+        procs = [
+            multiprocessing.Process(target=writer, args=(db_path, w, args.records, args.payload_bytes))
+            for w in range(args.writers)
+        ]
+        start = time.perf_counter()
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        elapsed = time.perf_counter() - start
+        failed = [p.exitcode for p in procs if p.exitcode != 0]
+
+        errors = verify(db_path, args.writers, args.records)
+        if failed:
+            errors.append(f"{len(failed)} writer processes failed")
+        total = args.writers * args.records
+        print(f"{args.writers} writers x {args.records} records: {elapsed:.2f}s ({total / elapsed:.0f} records/s)")
+        for error in errors:
+            print(f"FAIL: {error}")
+        if not errors:
+            print("OK: no lost, duplicated or torn records")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
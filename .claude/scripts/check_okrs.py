@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""Stop hook: block agents from stopping until every key result is ACHIEVED.
+
+Runs each time an agent tries to stop. Behaviour:
+
+- ``results/shared.md`` missing or empty      -> allow (no workflow running)
+- ``WORKFLOW STATUS: COMPLETED`` was recorded -> allow (workflow done)
+- otherwise every key result reported in an ``AGENT STATUS`` block must be
+  ``ACHIEVED``; if not, the stop is blocked with the outstanding results.
+
+shared.md is append-only in practice and grows large in long workflows, so
+the parse state is kept in a small index next to it
+(``results/.shared.md.okr-index.json``). Each run only parses the bytes
+appended since the previous run. If the file was truncated or rewritten the
+index is discarded and the whole file is rescanned.
+
+When agents report through the results store (``results/results.db``, see
+results_store.py) the hook queries the store's indexes. shared.md is then a
+view rendered from the store, but agents may still append markdown reports
+after it; those bytes are parsed incrementally from the end of the last
+rendered view, and a key result is outstanding if either source says so.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+from project import atomic_write, project_root
+from tracing import count, span
+
+INDEX_VERSION = 2
+# Bytes hashed on each side of the last parsed offset to detect rewrites.
+FINGERPRINT_BYTES = 4096
+
+AGENT_STATUS_RE = re.compile(r"^##\s*AGENT STATUS:\s*(?P<role>.+?)(?:\s+-\s+(?P<state>[A-Z _]+))?\s*$")
+WORKFLOW_COMPLETED_RE = re.compile(r"^##\s*WORKFLOW STATUS:\s*COMPLETED\b")
+HEADING_RE = re.compile(r"^#{1,2}\s")
+KEY_RESULT_RE = re.compile(
+    r"^\s*(?:\d+[.)]|[-*])\s*\**\[?(?P<name>.+?)\]?\**\s*:\s*\**"
+    r"(?P<status>NOT[ _]ACHIEVED|PARTIALLY[ _]ACHIEVED|ACHIEVED|PARTIAL|PENDING|IN[ _]PROGRESS|BLOCKED|FAILED)\b"
+)
+
+
+def default_index_path(shared_path: Path) -> Path:
+    return shared_path.with_name(f".{shared_path.name}.okr-index.json")
+
+
+def empty_state(start: int = 0, base: tuple[int, str] = (0, "")) -> dict:
+    return {
+        "version": INDEX_VERSION,
+        # The rendered view this state was parsed after, and where parsing began.
+        "base": list(base),
+        "start": start,
+        "offset": start,
+        "head_sha": "",
+        "tail_sha": "",
+        "current_role": None,
+        "workflow_completed": False,
+        "key_results_seen": 0,
+        # "<role>::<key result>" -> latest status, only for results not ACHIEVED.
+        # Keeping ACHIEVED results out keeps the index small on long runs.
+        "pending": {},
+    }
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _fingerprint(fh, offset: int) -> tuple[str, str]:
+    """Hash the first and the last FINGERPRINT_BYTES before ``offset``."""
+    fh.seek(0)
+    head = fh.read(min(offset, FINGERPRINT_BYTES))
+    tail_start = max(0, offset - FINGERPRINT_BYTES)
+    fh.seek(tail_start)
+    tail = fh.read(offset - tail_start)
+    return _sha(head), _sha(tail)
+
+
+def load_index(index_path: Path) -> dict | None:
+    try:
+        state = json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get("version") != INDEX_VERSION:
+        return None
+    return state
+
+
+def save_index(index_path: Path, state: dict) -> None:
+    try:
+        atomic_write(index_path, json.dumps(state))
+    except OSError:
+        pass  # The index is only a cache; failing to persist it must not break the hook.
+
+
+def parse_lines(state: dict, text: str) -> None:
+    """Fold complete lines of shared.md into ``state``."""
+    pending = state["pending"]
+    role = state["current_role"]
+    for line in text.splitlines():
+        if WORKFLOW_COMPLETED_RE.match(line):
+            state["workflow_completed"] = True
+            role = None
+            continue
+        match = AGENT_STATUS_RE.match(line)
+        if match:
+            role = match.group("role").strip()
+            continue
+        if HEADING_RE.match(line):
+            role = None
+            continue
+        if role is None:
+            continue
+        match = KEY_RESULT_RE.match(line)
+        if match:
+            status = match.group("status").replace("_", " ")
+            key = f"{role}::{match.group('name').strip()}"
+            state["key_results_seen"] += 1
+            if status == "ACHIEVED":
+                pending.pop(key, None)
+            else:
+                pending[key] = status
+    state["current_role"] = role
+
+
+def _verified_start(fh, size: int, base: tuple[int, str]) -> int:
+    """``base[0]`` if the file still starts with the view hashed in ``base``, else 0."""
+    start, sha = base
+    if not start or start > size:
+        return 0
+    digest = hashlib.sha256()
+    fh.seek(0)
+    remaining = start
+    while remaining:
+        block = fh.read(min(remaining, 1 << 20))
+        if not block:
+            return 0
+        digest.update(block)
+        remaining -= len(block)
+    return start if digest.hexdigest() == sha else 0
+
+
+def scan(
+    shared_path: Path,
+    index_path: Path | None = None,
+    full: bool = False,
+    base: tuple[int, str] = (0, ""),
+) -> dict:
+    """Bring the parse state up to date with ``shared_path`` and return it.
+
+    ``base`` is the ``(size, sha256)`` of a view the results store rendered
+    at the start of the file; only bytes after it are parsed. If the file no
+    longer starts with that view, all of it is parsed.
+    """
+    index_path = index_path or default_index_path(shared_path)
+    state = None if full else load_index(index_path)
+
+    with open(shared_path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if state is not None:
+            offset = state["offset"]
+            if state["base"] != list(base):
+                state = None  # re-rendered since the last run
+            elif offset > size or _fingerprint(fh, offset) != (state["head_sha"], state["tail_sha"]):
+                state = None  # truncated or rewritten
+        if state is None:
+            state = empty_state(_verified_start(fh, size, base), base)
+
+        offset = state["offset"]
+        fh.seek(offset)
+        chunk = fh.read(size - offset)
+        # Only complete lines are folded into the index; a final line without a
+        # newline may still be growing, so it is parsed into a copy of the state.
+        end = chunk.rfind(b"\n") + 1
+        if end:
+            parse_lines(state, chunk[:end].decode("utf-8", errors="replace"))
+            state["offset"] = offset + end
+            state["head_sha"], state["tail_sha"] = _fingerprint(fh, state["offset"])
+            save_index(index_path, state)
+        tail = chunk[end:]
+    if tail.strip():
+        state = copy.deepcopy(state)
+        parse_lines(state, tail.decode("utf-8", errors="replace"))
+    return state
+
+
+def evaluate(state: dict) -> tuple[bool, str]:
+    """Return ``(allow_stop, reason)`` for a parse state."""
+    if state["workflow_completed"]:
+        return True, "Workflow completed."
+    if not state["key_results_seen"]:
+        return False, "Workflow is active but no key results have been reported in results/shared.md yet."
+    pending = sorted(
+        f"- {key.replace('::', ': ', 1)} ({status})" for key, status in state["pending"].items()
+    )
+    count("okr.pending", len(pending))
+    if pending:
+        return False, "Key results not yet ACHIEVED:\n" + "\n".join(pending)
+    return True, "All key results ACHIEVED."
+
+
+def evaluate_store(
+    db_path: Path,
+    shared_path: Path,
+    index_path: Path | None = None,
+    full: bool = False,
+) -> tuple[bool, str]:
+    """Return ``(allow_stop, reason)`` from the results store plus any
+    markdown appended to shared.md after the store's last rendered view."""
+    from results_store import ResultsStore
+
+    with ResultsStore(db_path, readonly=True) as store:
+        completed = store.workflow_completed()
+        has_reports = store.has_reports()
+        has_key_results = store.has_key_results()
+        pending = {f"- {role}: {name} ({status})" for role, name, status in store.pending_key_results()}
+        base = store.rendered_view()
+
+    markdown = None
+    try:
+        if shared_path.stat().st_size:
+            state = scan(shared_path, index_path, full=full, base=base)
+            if shared_path.stat().st_size > state["start"]:
+                markdown = state
+    except FileNotFoundError:
+        pass
+
+    if completed or (markdown and markdown["workflow_completed"]):
+        return True, "Workflow completed."
+    if not has_reports:
+        return evaluate(markdown) if markdown else (True, "No active workflow.")
+    if markdown:
+        pending.update(f"- {key.replace('::', ': ', 1)} ({status})" for key, status in markdown["pending"].items())
+        has_key_results = has_key_results or bool(markdown["key_results_seen"])
+    if not has_key_results:
+        return False, "Workflow is active but no key results have been recorded in the results store yet."
+    count("okr.pending", len(pending))
+    if pending:
+        return False, "Key results not yet ACHIEVED:\n" + "\n".join(sorted(pending))
+    return True, "All key results ACHIEVED."
+
+
+def check(
+    shared_path: Path,
+    index_path: Path | None = None,
+    full: bool = False,
+    db_path: Path | None = None,
+) -> tuple[bool, str]:
+    db_path = db_path or shared_path.with_name("results.db")
+    with span("stop_hook.check_okrs") as s:
+        if db_path.exists():
+            s.set(source="results.db")
+            allow, reason = evaluate_store(db_path, shared_path, index_path, full)
+        else:
+            s.set(source="shared.md")
+            allow, reason = _check_shared(shared_path, index_path, full)
+        s.set(allow=allow)
+        if not allow:
+            count("stop_hook.blocked")
+    return allow, reason
+
+
+def _check_shared(shared_path: Path, index_path: Path | None, full: bool) -> tuple[bool, str]:
+    try:
+        if shared_path.stat().st_size == 0:
+            return True, "No active workflow."
+    except FileNotFoundError:
+        return True, "No active workflow."
+    return evaluate(scan(shared_path, index_path, full=full))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shared", type=Path, default=None, help="path to shared.md (default: results/shared.md)")
+    parser.add_argument("--index", type=Path, default=None, help="path to the incremental index file")
+    parser.add_argument("--full", action="store_true", help="ignore the index and rescan the whole file")
+    parser.add_argument("--db", type=Path, default=None, help="results store (default: results.db next to shared.md)")
+    args = parser.parse_args(argv)
+
+    shared_path = args.shared or project_root() / "results" / "shared.md"
+    allow, reason = check(shared_path, args.index, full=args.full, db_path=args.db)
+    if not allow:
+        print(json.dumps({"decision": "block", "reason": reason}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""Evaluate role preconditions (gates) from a workflow YAML concurrently.
+
+A gate's ``verification`` is machine-checkable when it uses one of these forms:
+
+- ``exists: <path>``    the path exists (relative to the project root)
+- ``nonempty: <path>``  the file is non-empty / the directory has entries
+- ``command: <shell>``  the shell command exits with status 0
+
+Any other verification text is reported as ``manual`` for the agent to
+check itself. Checkable gates run in a thread pool, each with its own
+timeout (the gate's ``timeout`` key, else ``--timeout``).
+
+Passing outcomes are cached in ``.claude/cache/gates.json``, keyed on the
+gate definition and the size and mtime of every file the gate depends on:
+its ``depends_on`` paths, or the path named by an ``exists``/``nonempty``
+check. A ``command`` gate without ``depends_on`` is never cached, since
+there is no telling which files the command reads. A re-execution only
+re-runs gates whose inputs changed or that did not pass last time. The report lists every gate with
+its timing, slowest first.
+
+    python .claude/scripts/check_preconditions.py workflows/my-workflow.yaml [--role analyst]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+import pydantic
+import yaml
+
+from project import atomic_write, project_root
+from tracing import count, span
+from workflow_model import Precondition, Workflow, load_workflow
+
+DEFAULT_TIMEOUT = 60.0
+CHECK_KINDS = ("exists", "nonempty", "command")
+
+
+def default_cache_path() -> Path:
+    return project_root() / ".claude" / "cache" / "gates.json"
+
+
+@dataclass
+class GateResult:
+    role: str
+    gate: str
+    status: str  # passed | failed | timeout | cached | manual
+    seconds: float
+    detail: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("passed", "cached", "manual")
+
+
+def parse_verification(verification: str) -> tuple[str, str] | None:
+    """Split ``"<kind>: <argument>"``; None for free-text verifications."""
+    kind, sep, argument = verification.partition(":")
+    kind = kind.strip().lower()
+    if not sep or kind not in CHECK_KINDS or not argument.strip():
+        return None
+    return kind, argument.strip()
+
+
+def dependencies(gate: Precondition, check: tuple[str, str]) -> list[str] | None:
+    """Paths whose state decides the gate's outcome; None if unknown (not cacheable)."""
+    if gate.depends_on:
+        return gate.depends_on
+    kind, argument = check
+    if kind in ("exists", "nonempty"):
+        return [argument]
+    return None
+
+
+def fingerprint(paths: list[str], root: Path) -> str:
+    """Hash the size and mtime of every file under ``paths``."""
+    digest = hashlib.sha256()
+    for rel in sorted(paths):
+        path = root / rel
+        if not path.exists():
+            digest.update(f"{rel}\0missing\n".encode())
+            continue
+        files = [path] if path.is_file() else sorted(p for p in path.rglob("*") if p.is_file())
+        if not files:
+            digest.update(f"{rel}\0empty\n".encode())
+        for file in files:
+            stat = file.stat()
+            # Relative to the dependency, not the root: depends_on may point outside the project.
+            name = file.relative_to(path).as_posix()
+            digest.update(f"{rel}\0{name}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def cache_key(role: str, gate: Precondition, inputs: str) -> str:
+    definition = json.dumps([role, gate.name, gate.verification, sorted(gate.depends_on)])
+    return hashlib.sha256(f"{definition}\0{inputs}".encode()).hexdigest()
+
+
+def load_cache(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_cache(path: Path, cache: dict) -> None:
+    try:
+        atomic_write(path, json.dumps(cache, indent=1))
+    except OSError:
+        pass  # Caching is best effort.
+
+
+def run_check(check: tuple[str, str], root: Path, timeout: float) -> tuple[str, str]:
+    """Run one check and return ``(status, detail)``."""
+    kind, argument = check
+    if kind == "exists":
+        return ("passed", "") if (root / argument).exists() else ("failed", f"{argument} does not exist")
+    if kind == "nonempty":
+        path = root / argument
+        if path.is_file() and path.stat().st_size > 0:
+            return "passed", ""
+        if path.is_dir() and any(p.name != ".gitkeep" for p in path.iterdir()):
+            return "passed", ""
+        return "failed", f"{argument} is missing or empty"
+    # A new session lets a timeout kill the whole process group, not just the shell.
+    proc = subprocess.Popen(
+        argument, shell=True, cwd=root, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        text=True, start_new_session=True,
+    )
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+        proc.communicate()
+        return "timeout", f"no result after {timeout:g}s"
+    if proc.returncode == 0:
+        return "passed", ""
+    output = (stderr or stdout).strip().splitlines()
+    return "failed", f"exit {proc.returncode}" + (f": {output[-1]}" if output else "")
+
+
+class GateEngine:
+    def __init__(
+        self,
+        root: Path | None = None,
+        workers: int = 8,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache_path: Path | None = None,
+        use_cache: bool = True,
+    ):
+        self.root = root or project_root()
+        self.workers = workers
+        self.timeout = timeout
+        self.cache_path = cache_path or default_cache_path()
+        self.use_cache = use_cache
+
+    def evaluate(self, workflow: Workflow, roles: set[str] | None = None) -> list[GateResult]:
+        cache = load_cache(self.cache_path) if self.use_cache else {}
+        results: list[GateResult] = []
+        pending = []  # (role, gate, check, cache key or None)
+        fingerprints: dict[tuple[str, ...], str] = {}  # gates often share dependencies
+        for role in workflow.people_involved:
+            if roles and role.role not in roles:
+                continue
+            for gate in role.preconditions:
+                start = time.perf_counter()
+                check = parse_verification(gate.verification)
+                if check is None:
+                    results.append(GateResult(role.role, gate.name, "manual", 0.0, gate.verification))
+                    continue
+                deps = dependencies(gate, check)
+                if deps is None:
+                    pending.append((role.role, gate, check, None))
+                    continue
+                deps = tuple(sorted(deps))
+                if deps not in fingerprints:
+                    fingerprints[deps] = fingerprint(list(deps), self.root)
+                key = cache_key(role.role, gate, fingerprints[deps])
+                if key in cache:
+                    detail = f"unchanged since {cache[key]}"
+                    results.append(GateResult(role.role, gate.name, "cached", time.perf_counter() - start, detail))
+                    count("gate.cached", role=role.role)
+                    continue
+                pending.append((role.role, gate, check, key))
+
+        def run(item) -> GateResult:
+            role, gate, check, _ = item
+            start = time.perf_counter()
+            with span("gate.check", role=role, gate=gate.name) as s:
+                status, detail = run_check(check, self.root, gate.timeout or self.timeout)
+                s.set(status=status)
+                count(f"gate.{status}", role=role)
+            return GateResult(role, gate.name, status, time.perf_counter() - start, detail)
+
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as pool:
+            for item, result in zip(pending, pool.map(run, pending)):
+                results.append(result)
+                if result.status == "passed" and item[3] is not None:
+                    cache[item[3]] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if self.use_cache and pending:
+            save_cache(self.cache_path, cache)
+        return results
+
+
+def format_report(results: list[GateResult], wall: float) -> str:
+    lines = [f"{'seconds':>8}  {'status':<8} role / gate"]
+    for r in sorted(results, key=lambda r: r.seconds, reverse=True):
+        detail = f"  ({r.detail})" if r.detail else ""
+        lines.append(f"{r.seconds:>8.3f}  {r.status:<8} {r.role} / {r.gate}{detail}")
+    counts: dict[str, int] = {}
+    for r in results:
+        counts[r.status] = counts.get(r.status, 0) + 1
+    summary = ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+    lines.append("")
+    lines.append(f"{len(results)} gates: {summary or 'none'}; "
+                 f"wall {wall:.3f}s, sum of gate times {sum(r.seconds for r in results):.3f}s")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Check workflow preconditions concurrently.")
+    parser.add_argument("workflow", type=Path)
+    parser.add_argument("--role", action="append", default=None, help="only check these roles (repeatable)")
+    parser.add_argument("--workers", type=int, default=8, help="checks run at once (default: 8)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="default per-gate timeout in seconds")
+    parser.add_argument("--no-cache", action="store_true", help="re-run every gate")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        workflow = load_workflow(args.workflow)
+    except (OSError, yaml.YAMLError, pydantic.ValidationError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    engine = GateEngine(workers=args.workers, timeout=args.timeout, use_cache=not args.no_cache)
+    start = time.perf_counter()
+    with span("preconditions.evaluate"):
+        results = engine.evaluate(workflow, set(args.role) if args.role else None)
+    wall = time.perf_counter() - start
+    if args.json:
+        print(json.dumps({"wall_seconds": wall, "gates": [asdict(r) for r in results]}, indent=2))
+    else:
+        print(format_report(results, wall))
+    return 0 if all(r.ok for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
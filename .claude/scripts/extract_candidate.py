@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""Extract text from source CVs (PDF/DOCX) before building candidate_data.json.
+
+PDF pages are read through the pypdfium2 text layer, in page ranges fanned
+out over a process pool and streamed back in page order. Only pages with
+an empty text layer are rendered and sent to OCR (paddleocr, if installed).
+DOCX files are read with python-docx.
+
+Results are cached under ``.claude/cache/extraction/`` keyed by the SHA-256
+of the source file, so re-running a workflow on the same documents skips
+extraction entirely. A cached result with pages that were never OCRed is
+re-extracted when OCR is enabled and paddleocr is installed. ``--max-memory-mb`` caps the address space of each
+worker process, and at most two page ranges per worker are in flight, so a
+very large PDF never has more than a bounded number of pages in memory.
+
+    python .claude/scripts/extract_candidate.py cv.pdf other_cv.docx -o results/extracted/
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator
+
+from project import atomic_write, project_root
+
+# Bump when the extraction output changes so stale cache entries are ignored.
+CACHE_VERSION = 1
+PAGES_PER_TASK = 8
+OCR_RENDER_SCALE = 2.0
+
+
+def default_cache_dir() -> Path:
+    return project_root() / ".claude" / "cache" / "extraction"
+
+
+def sha256_file(path: str | Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        while chunk := fh.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    def __init__(self, cache_dir: Path | None = None):
+        self.dir = cache_dir or default_cache_dir()
+
+    def _path(self, sha: str) -> Path:
+        return self.dir / f"{sha}.json"
+
+    def get(self, sha: str) -> dict | None:
+        try:
+            result = json.loads(self._path(sha).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return result if result.get("cache_version") == CACHE_VERSION else None
+
+    def put(self, sha: str, result: dict) -> None:
+        try:
+            atomic_write(self._path(sha), json.dumps(result))
+        except OSError:
+            pass  # Caching is best effort.
+
+
+# --- worker side -------------------------------------------------------------
+
+_ocr_engine = None
+_open_pdf: tuple[str, object] | None = None
+
+
+def _init_worker(max_memory_mb: int | None) -> None:
+    if max_memory_mb:
+        import resource
+
+        limit = max_memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _pdf(path: str):
+    """Keep the most recently used PDF open in this worker across page ranges."""
+    global _open_pdf
+    import pypdfium2 as pdfium
+
+    if _open_pdf is None or _open_pdf[0] != path:
+        if _open_pdf is not None:
+            _open_pdf[1].close()
+        _open_pdf = (path, pdfium.PdfDocument(path))
+    return _open_pdf[1]
+
+
+def ocr_available() -> bool:
+    return importlib.util.find_spec("paddleocr") is not None
+
+
+def _ocr(page) -> str | None:
+    """OCR a rendered page, or None when paddleocr is not installed."""
+    global _ocr_engine
+    if _ocr_engine is None:
+        try:
+            from paddleocr import PaddleOCR
+        except ImportError:
+            _ocr_engine = False
+        else:
+            _ocr_engine = PaddleOCR(use_textline_orientation=True)
+    if _ocr_engine is False:
+        return None
+    bitmap = page.render(scale=OCR_RENDER_SCALE)
+    try:
+        image = bitmap.to_numpy()
+        lines = []
+        for result in _ocr_engine.predict(image):
+            lines.extend(result["rec_texts"])
+        return "\n".join(lines)
+    finally:
+        bitmap.close()
+
+
+def extract_pdf_range(path: str, start: int, stop: int, ocr: bool) -> list[dict]:
+    """Extract pages ``[start, stop)`` of a PDF."""
+    pdf = _pdf(path)
+    pages = []
+    for index in range(start, stop):
+        page = pdf[index]
+        try:
+            textpage = page.get_textpage()
+            try:
+                text = textpage.get_text_bounded()
+            finally:
+                textpage.close()
+            source = "text"
+            if not text.strip():
+                ocr_text = _ocr(page) if ocr else None
+                if ocr_text is None:
+                    text, source = "", "needs_ocr"
+                else:
+                    text, source = ocr_text, "ocr"
+            pages.append({"page": index + 1, "source": source, "text": text})
+        finally:
+            page.close()
+    return pages
+
+
+def _pdf_page_count(path: str) -> int:
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(path)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+# --- main process -------------------------------------------------------------
+
+
+def iter_pdf_pages(
+    path: str | Path,
+    pool: Executor,
+    workers: int,
+    ocr: bool = True,
+    pages_per_task: int = PAGES_PER_TASK,
+) -> Iterator[dict]:
+    """Yield page dicts in order while later page ranges are still being extracted."""
+    path = str(path)
+    count = _pdf_page_count(path)
+    ranges = iter(range(0, count, pages_per_task))
+    in_flight: deque = deque()
+    max_in_flight = max(1, workers * 2)
+
+    def submit_next() -> bool:
+        start = next(ranges, None)
+        if start is None:
+            return False
+        in_flight.append(pool.submit(extract_pdf_range, path, start, min(start + pages_per_task, count), ocr))
+        return True
+
+    while len(in_flight) < max_in_flight and submit_next():
+        pass
+    while in_flight:
+        pages = in_flight.popleft().result()
+        submit_next()
+        yield from pages
+
+
+def extract_docx(path: str | Path) -> list[dict]:
+    from docx import Document
+
+    doc = Document(path)
+    lines = [p.text for p in doc.paragraphs if p.text.strip()]
+    for table in doc.tables:
+        for row in table.rows:
+            cells = [cell.text.strip() for cell in row.cells if cell.text.strip()]
+            if cells:
+                lines.append(" | ".join(cells))
+    # DOCX has no fixed pagination; report the document as a single page.
+    return [{"page": 1, "source": "text", "text": "\n".join(lines)}]
+
+
+class Extractor:
+    """Extract many documents, sharing one worker pool and one cache."""
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        ocr: bool = True,
+        cache_dir: Path | None = None,
+        use_cache: bool = True,
+        max_memory_mb: int | None = None,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.ocr = ocr
+        # Cached pages that were never OCRed are only worth retrying if an engine exists now.
+        self._retry_ocr = ocr and ocr_available()
+        self.cache = ExtractionCache(cache_dir) if use_cache else None
+        self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(max_memory_mb,))
+
+    def close(self) -> None:
+        self._pool.shutdown()
+
+    def __enter__(self) -> "Extractor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def extract(self, path: str | Path) -> dict:
+        path = Path(path)
+        sha = sha256_file(path)
+        if self.cache is not None:
+            cached = self.cache.get(sha)
+            # A result with un-OCRed pages came from a run without OCR (disabled
+            # or paddleocr not installed); retry them once OCR can actually run.
+            if cached is not None and not (self._retry_ocr and cached["needs_ocr_pages"]):
+                return {**cached, "source_file": str(path), "cached": True}
+
+        suffix = path.suffix.lower()
+        if suffix == ".pdf":
+            pages = list(iter_pdf_pages(path, self._pool, self.workers, self.ocr))
+        elif suffix == ".docx":
+            pages = extract_docx(path)
+        else:
+            raise ValueError(f"unsupported file type {suffix!r} (expected .pdf or .docx)")
+
+        result = {
+            "cache_version": CACHE_VERSION,
+            "sha256": sha,
+            "page_count": len(pages),
+            "ocr_pages": [p["page"] for p in pages if p["source"] == "ocr"],
+            "needs_ocr_pages": [p["page"] for p in pages if p["source"] == "needs_ocr"],
+            "text": "\n\n".join(p["text"] for p in pages if p["text"]),
+            "pages": pages,
+        }
+        if self.cache is not None:
+            self.cache.put(sha, result)
+        return {**result, "source_file": str(path), "cached": False}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Extract text from source CVs (PDF/DOCX).")
+    parser.add_argument("files", nargs="+", type=Path)
+    parser.add_argument("-o", "--output", type=Path, default=None,
+                        help="directory for <name>.json results (default: print to stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--no-ocr", action="store_true", help="do not OCR pages without a text layer")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the extraction cache")
+    parser.add_argument("--max-memory-mb", type=int, default=None, help="address-space limit per worker process")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    with Extractor(args.workers, not args.no_ocr, use_cache=not args.no_cache,
+                   max_memory_mb=args.max_memory_mb) as extractor:
+        for path in args.files:
+            try:
+                result = extractor.extract(path)
+            except Exception as exc:  # noqa: BLE001 - report and continue with the next file
+                print(f"error: {path}: {type(exc).__name__}: {exc}", file=sys.stderr)
+                failures += 1
+                continue
+            if result["needs_ocr_pages"]:
+                print(f"warning: {path}: pages {result['needs_ocr_pages']} have no text layer "
+                      "and were not OCRed", file=sys.stderr)
+            if args.output:
+                args.output.mkdir(parents=True, exist_ok=True)
+                out = args.output / f"{path.stem}.json"
+                out.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+                print(out)
+            else:
+                print(json.dumps(result, ensure_ascii=False))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""Local BM25 retrieval over the ``domain knowledge/`` folder.
+
+Instead of reading whole knowledge sources, agents query for the chunks
+relevant to their task. ``build`` walks the folder, splits documents into
+paragraph-aligned chunks and stores an inverted index in SQLite
+(``.claude/cache/knowledge/index.db``). Rebuilds are incremental: files
+whose size and mtime are unchanged are skipped without reading, files
+whose content hash is unchanged are only re-stamped, and only changed or
+new files are re-chunked. Deleted files are dropped. Everything is local.
+Concurrent builds take turns on the database write lock; ``query`` updates
+the index first, unless another process is already doing so.
+
+Text-like files (.md, .txt, .csv, .json, .yaml, .html, ...) are indexed
+directly; .docx and .pdf are read with the helpers in extract_candidate.py.
+
+    python .claude/scripts/knowledge_index.py build
+    python .claude/scripts/knowledge_index.py query "pricing policy for enterprise customers" -k 5
+    python .claude/scripts/knowledge_index.py query --workflow workflows/my-workflow.yaml --role analyst
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import math
+import re
+import sqlite3
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from project import project_root
+
+# Bump when chunking or tokenization changes; forces a full re-index.
+INDEX_VERSION = 2
+CHUNK_WORDS = 200
+BM25_K1 = 1.5
+BM25_B = 0.75
+# Builds hold the write lock for their whole run; a cold build of a large
+# folder takes a while, so other builders wait rather than fail.
+BUSY_TIMEOUT_S = 600.0
+
+TEXT_SUFFIXES = {
+    ".md", ".markdown", ".txt", ".rst", ".csv", ".tsv", ".json", ".jsonl",
+    ".yaml", ".yml", ".html", ".htm", ".xml", ".py", ".sql", ".ini", ".toml",
+}
+EXTRACTED_SUFFIXES = {".docx", ".pdf"}
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+TAG_RE = re.compile(r"<[^>]+>")
+# A paragraph runs until a blank line; separators may span several blank lines.
+PARAGRAPH_RE = re.compile(r"\S.*?(?=\n[ \t\r\f\v]*\n|\Z)", re.DOTALL)
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have if in into is it its of on or "
+    "that the their there these this to was were will with which who what when where how".split()
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (
+    path     TEXT PRIMARY KEY,
+    sha256   TEXT NOT NULL,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    id     INTEGER PRIMARY KEY,
+    path   TEXT NOT NULL,
+    ordinal INTEGER NOT NULL,
+    line   INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    text   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chunks_path ON chunks (path);
+-- Chunk length is repeated in each posting so scoring needs no join.
+CREATE TABLE IF NOT EXISTS postings (
+    term     TEXT NOT NULL,
+    chunk_id INTEGER NOT NULL,
+    tf       INTEGER NOT NULL,
+    length   INTEGER NOT NULL,
+    PRIMARY KEY (term, chunk_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_chunk ON postings (chunk_id);
+"""
+
+
+def default_source_dir() -> Path:
+    return project_root() / "domain knowledge"
+
+
+def default_db_path() -> Path:
+    return project_root() / ".claude" / "cache" / "knowledge" / "index.db"
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def read_document(path: Path) -> str:
+    suffix = path.suffix.lower()
+    if suffix in (".docx", ".pdf"):
+        import extract_candidate
+
+        if suffix == ".docx":
+            pages = extract_candidate.extract_docx(path)
+        else:
+            count = extract_candidate._pdf_page_count(str(path))
+            pages = extract_candidate.extract_pdf_range(str(path), 0, count, ocr=False)
+        return "\n\n".join(p["text"] for p in pages)
+    text = path.read_text(encoding="utf-8", errors="replace")
+    if suffix in (".html", ".htm", ".xml"):
+        text = TAG_RE.sub(" ", text)
+    return text
+
+
+def chunk_text(text: str, max_words: int = CHUNK_WORDS) -> list[tuple[int, str]]:
+    """Split into ``(start_line, text)`` chunks of whole paragraphs, ~max_words each.
+
+    A heading always starts a new chunk; a single paragraph longer than
+    ``max_words`` is split on word boundaries.
+    """
+    chunks: list[tuple[int, str]] = []
+    current: list[str] = []
+    current_words = 0
+    start_line = 1
+
+    def flush() -> None:
+        nonlocal current, current_words
+        if current:
+            chunks.append((start_line, "\n\n".join(current)))
+        current, current_words = [], 0
+
+    line_no, pos = 1, 0
+    for match in PARAGRAPH_RE.finditer(text):
+        # Count lines up to the block's real start: separators vary in length.
+        line_no += text.count("\n", pos, match.start())
+        pos = match.start()
+        block_line = line_no
+        block = match.group().strip()
+        words = len(block.split())
+        if block.startswith("#") or current_words + words > max_words:
+            flush()
+        if not current:
+            start_line = block_line
+        if words > max_words:
+            parts = block.split()
+            for i in range(0, len(parts), max_words):
+                chunks.append((block_line, " ".join(parts[i:i + max_words])))
+            continue
+        current.append(block)
+        current_words += words
+    flush()
+    return chunks
+
+
+@dataclass
+class Hit:
+    path: str
+    ordinal: int
+    line: int
+    score: float
+    text: str
+
+
+@dataclass
+class BuildStats:
+    scanned: int = 0
+    indexed: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    failed: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        while chunk := fh.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class KnowledgeIndex:
+    def __init__(self, source_dir: str | Path | None = None, db_path: str | Path | None = None):
+        self.source_dir = Path(source_dir) if source_dir else default_source_dir()
+        self.db_path = Path(db_path) if db_path else default_db_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT_S, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(SCHEMA)
+        if self._meta("version") != str(INDEX_VERSION):
+            with self._transaction():
+                version = self._meta("version")  # re-read under the lock
+                if version is not None and int(version) != INDEX_VERSION:
+                    self._clear()
+                self._set_meta("version", str(INDEX_VERSION))
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "KnowledgeIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _begin(self, wait: bool = True) -> None:
+        """Take the write lock; with ``wait=False`` fail at once if another build holds it."""
+        conn = self._conn
+        if not wait:
+            conn.execute("PRAGMA busy_timeout = 0")
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        finally:
+            if not wait:
+                conn.execute(f"PRAGMA busy_timeout = {int(BUSY_TIMEOUT_S * 1000)}")
+
+    @contextmanager
+    def _transaction(self):
+        self._begin()
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def is_built(self) -> bool:
+        return self._meta("chunk_count") is not None
+
+    def _meta(self, key: str) -> str | None:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _clear(self) -> None:
+        for table in ("postings", "chunks", "files"):
+            self._conn.execute(f"DELETE FROM {table}")
+
+    def _remove_file(self, rel: str) -> None:
+        conn = self._conn
+        conn.execute("DELETE FROM postings WHERE chunk_id IN (SELECT id FROM chunks WHERE path = ?)", (rel,))
+        conn.execute("DELETE FROM chunks WHERE path = ?", (rel,))
+        conn.execute("DELETE FROM files WHERE path = ?", (rel,))
+
+    def _index_file(self, rel: str, text: str) -> int:
+        conn = self._conn
+        chunks = chunk_text(text)
+        for ordinal, (line, chunk) in enumerate(chunks):
+            terms = Counter(tokenize(chunk))
+            length = sum(terms.values())
+            chunk_id = conn.execute(
+                "INSERT INTO chunks (path, ordinal, line, length, text) VALUES (?, ?, ?, ?, ?)",
+                (rel, ordinal, line, length, chunk),
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO postings (term, chunk_id, tf, length) VALUES (?, ?, ?, ?)",
+                [(term, chunk_id, tf, length) for term, tf in terms.items()],
+            )
+        return len(chunks)
+
+    def _source_files(self) -> dict[str, Path]:
+        files = {}
+        if not self.source_dir.is_dir():
+            return files
+        for path in self.source_dir.rglob("*"):
+            suffix = path.suffix.lower()
+            if path.is_file() and not path.name.startswith(".") and (
+                suffix in TEXT_SUFFIXES or suffix in EXTRACTED_SUFFIXES
+            ):
+                files[path.relative_to(self.source_dir).as_posix()] = path
+        return files
+
+    def build(self, wait: bool = True) -> BuildStats | None:
+        """Bring the index up to date with the source folder.
+
+        Concurrent builds are serialized on the write lock, and each reads
+        the file table only once it holds the lock. With ``wait=False``,
+        returns None instead of waiting when another build is running.
+        """
+        start = time.perf_counter()
+        stats = BuildStats()
+        conn = self._conn
+        current = self._source_files()
+        stats.scanned = len(current)
+
+        try:
+            self._begin(wait)
+        except sqlite3.OperationalError as exc:
+            if wait or "locked" not in str(exc):
+                raise
+            return None
+        try:
+            known = {row[0]: row[1:] for row in conn.execute("SELECT path, sha256, size, mtime_ns FROM files")}
+            for rel in known.keys() - current.keys():
+                self._remove_file(rel)
+                stats.removed += 1
+            for rel, path in sorted(current.items()):
+                stat = path.stat()
+                previous = known.get(rel)
+                if previous and previous[1:] == (stat.st_size, stat.st_mtime_ns):
+                    stats.unchanged += 1
+                    continue
+                sha = _sha256(path)
+                if previous and previous[0] == sha:
+                    conn.execute(
+                        "UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?",
+                        (stat.st_size, stat.st_mtime_ns, rel),
+                    )
+                    stats.unchanged += 1
+                    continue
+                try:
+                    text = read_document(path)
+                except Exception as exc:  # noqa: BLE001 - one unreadable file must not stop the build
+                    print(f"warning: cannot index {rel}: {type(exc).__name__}: {exc}", file=sys.stderr)
+                    stats.failed += 1
+                    continue
+                if previous:
+                    self._remove_file(rel)
+                stats.chunks += self._index_file(rel, text)
+                conn.execute(
+                    "INSERT INTO files (path, sha256, size, mtime_ns) VALUES (?, ?, ?, ?)",
+                    (rel, sha, stat.st_size, stat.st_mtime_ns),
+                )
+                stats.indexed += 1
+            count, avg = conn.execute("SELECT count(*), coalesce(avg(length), 0) FROM chunks").fetchone()
+            self._set_meta("chunk_count", str(count))
+            self._set_meta("avg_length", str(avg))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        stats.seconds = time.perf_counter() - start
+        return stats
+
+    def search(self, query: str, k: int = 5, paths: list[str] | None = None) -> list[Hit]:
+        """Top-``k`` chunks for ``query`` by BM25, optionally restricted to path prefixes."""
+        terms = set(tokenize(query))
+        n = int(self._meta("chunk_count") or 0)
+        avg = float(self._meta("avg_length") or 0) or 1.0
+        if not terms or not n:
+            return []
+        allowed = None
+        if paths:
+            prefixes = [p.strip("/") for p in paths]
+            allowed = {
+                chunk_id
+                for chunk_id, path in self._conn.execute("SELECT id, path FROM chunks")
+                if any(path == p or path.startswith(p + "/") for p in prefixes)
+            }
+
+        scores: dict[int, float] = {}
+        for term in terms:
+            postings = self._conn.execute("SELECT chunk_id, tf, length FROM postings WHERE term = ?", (term,)).fetchall()
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for chunk_id, tf, length in postings:
+                if allowed is not None and chunk_id not in allowed:
+                    continue
+                norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (BM25_K1 + 1) / norm
+
+        top = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+        hits = []
+        for chunk_id, score in top:
+            path, ordinal, line, text = self._conn.execute(
+                "SELECT path, ordinal, line, text FROM chunks WHERE id = ?", (chunk_id,)
+            ).fetchone()
+            hits.append(Hit(path, ordinal, line, score, text))
+        return hits
+
+
+def role_query(workflow_path: Path, role_name: str, source_dir: Path) -> tuple[str, list[str]]:
+    """Build a query from a role's task and the knowledge-folder paths it lists."""
+    from workflow_model import load_workflow
+
+    workflow = load_workflow(workflow_path)
+    for role in workflow.people_involved:
+        if role.role == role_name:
+            break
+    else:
+        raise ValueError(f"role {role_name!r} not found in {workflow_path}")
+    parts = [role.description, *role.okr.objectives, *(kr.result for kr in role.okr.key_results), *role.outputs]
+    paths = []
+    root = source_dir.resolve()
+    for source in role.knowledge_sources:
+        candidate = (project_root() / source.path).resolve()
+        if candidate == root:
+            paths = []  # the whole folder
+            break
+        if root in candidate.parents:
+            paths.append(candidate.relative_to(root).as_posix())
+    return " ".join(p for p in parts if p), paths
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Index and query the domain knowledge folder (BM25, offline).")
+    parser.add_argument("--source", type=Path, default=None, help="folder to index (default: 'domain knowledge/')")
+    parser.add_argument("--db", type=Path, default=None, help="index database path")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="create or incrementally update the index")
+    query = sub.add_parser("query", help="print the top-k chunks for a query")
+    query.add_argument("text", nargs="?", default="", help="query text")
+    query.add_argument("-k", type=int, default=5)
+    query.add_argument("--workflow", type=Path, help="build the query from a role in this workflow")
+    query.add_argument("--role", help="role name (with --workflow)")
+    query.add_argument("--no-update", action="store_true", help="skip the incremental update before querying")
+    args = parser.parse_args(argv)
+
+    with KnowledgeIndex(args.source, args.db) as index:
+        if args.command == "build":
+            s = index.build()
+            print(f"{s.scanned} files: {s.indexed} indexed ({s.chunks} chunks), {s.unchanged} unchanged, "
+                  f"{s.removed} removed, {s.failed} failed in {s.seconds:.2f}s")
+            return 1 if s.failed else 0
+
+        text, paths = args.text, None
+        if args.workflow:
+            if not args.role:
+                parser.error("--workflow needs --role")
+            role_text, paths = role_query(args.workflow, args.role, index.source_dir)
+            text = f"{text} {role_text}".strip()
+        if not text:
+            parser.error("give query text or --workflow/--role")
+        # Once an index exists, don't queue behind another process's build:
+        # search what is there while that build brings it up to date.
+        if not args.no_update and index.build(wait=not index.is_built()) is None:
+            print("note: index is being updated by another process; searching the current index", file=sys.stderr)
+        for hit in index.search(text, args.k, paths or None):
+            print(f"## {hit.path}:{hit.line} (score {hit.score:.2f})\n{hit.text}\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""Render CVs from candidate data with a docxtpl template.
+
+Single CV (what the Jinja2-cv skill does per candidate):
+
+    python .claude/scripts/render_cv.py candidate_data.json -o results/cv.docx
+
+Batch mode takes a directory of ``*.json`` files or a JSONL stream (a file
+or ``-`` for stdin, one candidate record per line) and renders them over a
+process pool. Each worker reads the template bytes and builds the Jinja
+environment once; the patched document XML and its compiled Jinja template
+are cached after the first render, so later renders only pay for copying
+the parsed document and executing the template. A failing record
+is reported and skipped without affecting the others, and a summary is
+written to ``<output-dir>/batch_report.json``.
+
+    python .claude/scripts/render_cv.py --batch candidates/ -o results/cvs --workers 8
+    python .claude/scripts/render_cv.py --batch candidates.jsonl -o results/cvs
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import io
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterator
+
+from docx import Document
+from docxtpl import DocxTemplate
+from jinja2 import Environment, Template
+
+from project import project_root
+from tracing import count, span
+
+
+def default_template() -> Path:
+    return project_root() / "templates" / "EZ_Template_docxtpl.docx"
+
+
+class CachingEnvironment(Environment):
+    """Jinja environment that compiles each distinct template source once."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._compiled: dict[str, Template] = {}
+
+    def from_string(self, source, globals=None, template_class=None):
+        if globals is not None or template_class is not None or not isinstance(source, str):
+            return super().from_string(source, globals, template_class)
+        template = self._compiled.get(source)
+        if template is None:
+            template = self._compiled[source] = super().from_string(source)
+        return template
+
+
+class CachedDocxTemplate(DocxTemplate):
+    """DocxTemplate that parses the template docx once and can be rendered repeatedly.
+
+    Rendering replaces parts of the loaded document in place, so each render
+    starts from a deep copy of the pristine parsed document instead of
+    re-reading and re-parsing the docx package. The copy is taken whether or
+    not the previous render finished: a render that fails in a header has
+    already replaced the body, which must not leak into the next record.
+    """
+
+    def __init__(self, template_bytes: bytes):
+        self._patched: dict[str, str] = {}
+        super().__init__(io.BytesIO(template_bytes))
+        self._pristine = Document(self.template_file)
+
+    def init_docx(self, reload: bool = True):
+        if self.docx is None or (self.is_rendered and reload):
+            self.docx = copy.deepcopy(self._pristine)
+            self.is_rendered = False
+
+    def render_init(self):
+        self.docx = copy.deepcopy(self._pristine)
+        self.is_rendered = False
+        super().render_init()
+
+    def patch_xml(self, src_xml: str) -> str:
+        patched = self._patched.get(src_xml)
+        if patched is None:
+            patched = self._patched[src_xml] = super().patch_xml(src_xml)
+        return patched
+
+
+class CVRenderer:
+    def __init__(self, template_path: str | Path):
+        self.template = CachedDocxTemplate(Path(template_path).read_bytes())
+        self.jinja_env = CachingEnvironment()
+
+    def render(self, context: dict, output: str | Path) -> None:
+        with span("cv.render", output=str(output)):
+            self.template.render(context, self.jinja_env)
+            self.template.save(output)
+
+
+def render_cv(data_path: str | Path, output: str | Path, template_path: str | Path | None = None) -> None:
+    with open(data_path, encoding="utf-8") as fh:
+        context = json.load(fh)
+    CVRenderer(template_path or default_template()).render(context, output)
+
+
+@dataclass
+class RecordResult:
+    record_id: str
+    output: str | None
+    ok: bool
+    seconds: float
+    error: str | None = None
+
+
+# (record_id, source_path, inline_record, output_path, error)
+Job = tuple[str, str | None, object, str, str | None]
+
+_SAFE_NAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
+_worker_renderer: CVRenderer | None = None
+
+
+def _init_worker(template_path: str) -> None:
+    global _worker_renderer
+    _worker_renderer = CVRenderer(template_path)
+
+
+def _render_record(job: Job) -> RecordResult:
+    """Render one record in a worker; never raises."""
+    record_id, source, context, output, error = job
+    start = time.perf_counter()
+    if error:
+        return RecordResult(record_id, None, False, 0.0, error)
+    try:
+        if source is not None:
+            with open(source, encoding="utf-8") as fh:
+                context = json.load(fh)
+        if not isinstance(context, dict):
+            raise ValueError(f"candidate record must be a JSON object, got {type(context).__name__}")
+        _worker_renderer.render(context, output)
+    except Exception as exc:  # noqa: BLE001 - isolate per-record failures
+        return RecordResult(record_id, None, False, time.perf_counter() - start, f"{type(exc).__name__}: {exc}")
+    return RecordResult(record_id, output, True, time.perf_counter() - start)
+
+
+def _record_id(data: object, fallback: str) -> str:
+    if isinstance(data, dict):
+        for key in ("id", "candidate_id", "name", "full_name"):
+            if data.get(key):
+                return str(data[key])
+    return fallback
+
+
+def iter_jobs(source: str, output_dir: Path) -> Iterator[Job]:
+    """Yield ``(record_id, source_path, inline_record, output_path, error)`` jobs.
+
+    Directory records are read by the workers; JSONL records are streamed
+    line by line and sent to workers inline. Lines that are not valid JSON
+    become jobs carrying an error, so they show up in the report.
+    """
+    used: set[str] = set()
+
+    def output_for(record_id: str) -> str:
+        name = _SAFE_NAME_RE.sub("_", record_id).strip("._") or "cv"
+        candidate, n = name, 1
+        while candidate in used:
+            n += 1
+            candidate = f"{name}-{n}"
+        used.add(candidate)
+        return str(output_dir / f"{candidate}.docx")
+
+    path = Path(source)
+    if source != "-" and path.is_dir():
+        for file in sorted(path.glob("*.json")):
+            yield file.stem, str(file), None, output_for(file.stem), None
+        return
+
+    stream = sys.stdin if source == "-" else open(path, encoding="utf-8")
+    try:
+        for lineno, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            fallback = f"line-{lineno}"
+            try:
+                data = json.loads(line)
+            except ValueError as exc:
+                yield fallback, None, None, output_for(fallback), f"invalid JSON: {exc}"
+                continue
+            record_id = _record_id(data, fallback)
+            yield record_id, None, data, output_for(record_id), None
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def run_batch(
+    source: str,
+    output_dir: str | Path,
+    template_path: str | Path | None = None,
+    workers: int | None = None,
+) -> dict:
+    """Render every record from ``source`` into ``output_dir`` and return the summary."""
+    template_path = str(template_path or default_template())
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    with span("cv.batch", workers=workers) as s:
+        if workers == 1:
+            _init_worker(template_path)
+            results = [_render_record(job) for job in iter_jobs(source, output_dir)]
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(template_path,)) as pool:
+                results = list(pool.map(_render_record, iter_jobs(source, output_dir), chunksize=4))
+        s.set(records=len(results))
+    elapsed = time.perf_counter() - start
+
+    failed = [r for r in results if not r.ok]
+    count("cv.rendered", len(results) - len(failed))
+    count("cv.failed", len(failed))
+    summary = {
+        "template": template_path,
+        "workers": workers,
+        "total": len(results),
+        "rendered": len(results) - len(failed),
+        "failed": len(failed),
+        "seconds": round(elapsed, 3),
+        "cvs_per_second": round(len(results) / elapsed, 2) if elapsed else None,
+        "failures": [asdict(r) for r in failed],
+    }
+    (output_dir / "batch_report.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Render CVs from candidate data with a docxtpl template.")
+    parser.add_argument("source", help="candidate_data.json, or with --batch a directory / JSONL file / '-'")
+    parser.add_argument("-o", "--output", required=True, help="output .docx (single) or directory (--batch)")
+    parser.add_argument("--template", default=None, help="docxtpl template (default: templates/EZ_Template_docxtpl.docx)")
+    parser.add_argument("--batch", action="store_true", help="render many records over a process pool")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for --batch (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    if not args.batch:
+        render_cv(args.source, args.output, args.template)
+        print(args.output)
+        return 0
+
+    summary = run_batch(args.source, args.output, args.template, args.workers)
+    print(
+        f"Rendered {summary['rendered']}/{summary['total']} CVs in {summary['seconds']}s "
+        f"({summary['cvs_per_second']} CVs/s, {summary['workers']} workers)"
+    )
+    for failure in summary["failures"]:
+        print(f"  FAILED {failure['record_id']}: {failure['error']}", file=sys.stderr)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
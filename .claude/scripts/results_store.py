@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""Structured results store shared by role agents and the stop hook.
+
+Agents record their status reports here instead of appending markdown to
+``results/shared.md``. The store is a SQLite database in WAL mode
+(``results/results.db``): every report is written in a single transaction,
+so concurrent agents never interleave or tear each other's records, and
+readers are not blocked by writers. shared.md becomes a view rendered from
+the store on demand.
+
+Agents that still append markdown reports to shared.md are not lost: the
+store remembers the size and hash of the view it last rendered, and before
+rendering again it imports the AGENT STATUS blocks appended after that view
+(or the whole file, on the first render). Markdown it cannot import, or a
+view that was edited in place, makes ``render`` refuse to overwrite
+shared.md unless ``--force`` is given.
+
+The latest status of every key result is kept in an indexed table, so
+"which key results are not ACHIEVED" and "what is role X's status" are
+lookups rather than full-text scans.
+
+    python .claude/scripts/results_store.py record --role analyst --state COMPLETED \\
+        --status completed --kr "Market report written=ACHIEVED" --notes "results/report.docx"
+    python .claude/scripts/results_store.py pending
+    python .claude/scripts/results_store.py status analyst
+    python .claude/scripts/results_store.py complete
+    python .claude/scripts/results_store.py render
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import re
+import sqlite3
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+
+from check_okrs import AGENT_STATUS_RE, HEADING_RE, KEY_RESULT_RE, WORKFLOW_COMPLETED_RE
+from project import atomic_write, project_root
+from tracing import span
+
+BUSY_TIMEOUT_MS = 30_000
+# workflow-table keys describing the last view written to shared.md.
+RENDERED_SIZE_KEY = "shared_md_size"
+RENDERED_SHA_KEY = "shared_md_sha256"
+
+TITLE_RE = re.compile(r"^#\s*Shared Results\s*$")
+FIELD_RE = re.compile(r"^\s*\*\*(?P<field>Timestamp|Status)\*\*\s*:\s*(?P<value>.*?)\s*$")
+KEY_RESULTS_HEADING_RE = re.compile(r"^#{3,}\s*Key Results:?\s*$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    role      TEXT NOT NULL,
+    state     TEXT NOT NULL,
+    status    TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    notes     TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS reports_role ON reports (role, id);
+
+CREATE TABLE IF NOT EXISTS report_key_results (
+    report_id INTEGER NOT NULL REFERENCES reports (id),
+    position  INTEGER NOT NULL,
+    name      TEXT NOT NULL,
+    status    TEXT NOT NULL,
+    PRIMARY KEY (report_id, position)
+);
+
+-- Latest status per (role, key result); what the stop hook queries.
+CREATE TABLE IF NOT EXISTS key_results (
+    role      TEXT NOT NULL,
+    name      TEXT NOT NULL,
+    status    TEXT NOT NULL,
+    report_id INTEGER NOT NULL,
+    PRIMARY KEY (role, name)
+);
+CREATE INDEX IF NOT EXISTS key_results_pending ON key_results (role, name) WHERE status != 'ACHIEVED';
+
+CREATE TABLE IF NOT EXISTS workflow (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def default_db_path() -> Path:
+    return project_root() / "results" / "results.db"
+
+
+@dataclass
+class Report:
+    role: str
+    state: str
+    status: str
+    timestamp: str
+    notes: str = ""
+    key_results: list[tuple[str, str]] = field(default_factory=list)
+    id: int | None = None
+
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+class SharedMarkdownError(RuntimeError):
+    """shared.md holds markdown the store cannot import, so it is not overwritten."""
+
+
+def parse_markdown(text: str) -> tuple[list[Report], bool, list[str]]:
+    """Parse shared.md markdown into reports.
+
+    Returns ``(reports, workflow_completed, stray)``; ``stray`` holds the
+    non-blank lines outside any AGENT STATUS or WORKFLOW STATUS block.
+    """
+    reports: list[Report] = []
+    completed = False
+    stray: list[str] = []
+    current: Report | None = None
+    in_workflow_block = False
+    for line in text.splitlines():
+        if WORKFLOW_COMPLETED_RE.match(line):
+            completed, current, in_workflow_block = True, None, True
+            continue
+        match = AGENT_STATUS_RE.match(line)
+        if match:
+            current = Report(match.group("role").strip(), (match.group("state") or "COMPLETED").strip(), "completed", "")
+            reports.append(current)
+            in_workflow_block = False
+            continue
+        if HEADING_RE.match(line) and not TITLE_RE.match(line):
+            current, in_workflow_block = None, False
+        if current is None:
+            field_match = FIELD_RE.match(line)
+            if line.strip() and not TITLE_RE.match(line) and not (in_workflow_block and field_match):
+                stray.append(line)
+            continue
+        field_match = FIELD_RE.match(line)
+        if field_match and field_match.group("field") == "Timestamp" and not current.timestamp:
+            current.timestamp = field_match.group("value")
+        elif field_match and field_match.group("field") == "Status":
+            current.status = (field_match.group("value").split() or ["completed"])[0]
+        elif KEY_RESULTS_HEADING_RE.match(line):
+            pass
+        elif match := KEY_RESULT_RE.match(line):
+            current.key_results.append((match.group("name").strip(), match.group("status")))
+        else:
+            current.notes += line + "\n"
+    for report in reports:
+        report.notes = report.notes.strip()
+    return reports, completed, stray
+
+
+def _signature(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _insert_report(conn: sqlite3.Connection, report: Report) -> int:
+    key_results = [(name.strip(), status.strip().upper().replace("_", " ")) for name, status in report.key_results]
+    cur = conn.execute(
+        "INSERT INTO reports (role, state, status, timestamp, notes) VALUES (?, ?, ?, ?, ?)",
+        (report.role, report.state.upper(), report.status.lower(), report.timestamp or _now(), report.notes),
+    )
+    report_id = cur.lastrowid
+    conn.executemany(
+        "INSERT INTO report_key_results (report_id, position, name, status) VALUES (?, ?, ?, ?)",
+        [(report_id, i, name, status) for i, (name, status) in enumerate(key_results)],
+    )
+    conn.executemany(
+        "INSERT INTO key_results (role, name, status, report_id) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (role, name) DO UPDATE SET status = excluded.status, report_id = excluded.report_id",
+        [(report.role, name, status, report_id) for name, status in key_results],
+    )
+    return report_id
+
+
+class ResultsStore:
+    """The results database; ``readonly`` opens an existing one without creating or migrating it."""
+
+    def __init__(self, path: str | Path | None = None, readonly: bool = False):
+        self.path = Path(path) if path else default_db_path()
+        if readonly:
+            # The stop hook switches to the store once the file exists, so
+            # queries must never create it.
+            uri = f"{self.path.resolve().as_uri()}?mode=ro"
+            self._conn = sqlite3.connect(uri, uri=True, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            self._conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+        self._conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _write(self, statements) -> None:
+        # BEGIN IMMEDIATE takes the write lock up front, so the whole report
+        # lands atomically or not at all.
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            statements(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def record(
+        self,
+        role: str,
+        state: str,
+        status: str,
+        key_results: Iterable[tuple[str, str]] = (),
+        notes: str = "",
+        timestamp: str | None = None,
+    ) -> int:
+        """Store one AGENT STATUS report and return its id."""
+        report = Report(role, state, status, timestamp or "", notes, list(key_results))
+        report_id = 0
+
+        def statements(conn: sqlite3.Connection) -> None:
+            nonlocal report_id
+            report_id = _insert_report(conn, report)
+
+        with span("results.write", role=role, key_results=len(report.key_results)):
+            self._write(statements)
+        return report_id
+
+    def mark_workflow_completed(self) -> None:
+        self._write(lambda conn: conn.execute(
+            "INSERT OR REPLACE INTO workflow (key, value) VALUES ('completed_at', ?)", (_now(),)
+        ))
+
+    def reset(self) -> None:
+        """Clear all records, e.g. when a new workflow run starts.
+
+        What was last rendered to shared.md is still remembered, so the old
+        view is not mistaken for reports appended by hand.
+        """
+        def statements(conn: sqlite3.Connection) -> None:
+            for table in ("report_key_results", "key_results", "reports"):
+                conn.execute(f"DELETE FROM {table}")
+            conn.execute("DELETE FROM workflow WHERE key = 'completed_at'")
+
+        self._write(statements)
+
+    def workflow_completed(self) -> bool:
+        row = self._conn.execute("SELECT 1 FROM workflow WHERE key = 'completed_at'").fetchone()
+        return row is not None
+
+    def rendered_view(self) -> tuple[int, str]:
+        """``(size, sha256)`` of the view last written to shared.md; ``(0, "")`` if none."""
+        values = dict(self._conn.execute(
+            "SELECT key, value FROM workflow WHERE key IN (?, ?)", (RENDERED_SIZE_KEY, RENDERED_SHA_KEY)
+        ).fetchall())
+        if RENDERED_SIZE_KEY not in values or RENDERED_SHA_KEY not in values:
+            return 0, ""
+        return int(values[RENDERED_SIZE_KEY]), values[RENDERED_SHA_KEY]
+
+    def has_reports(self) -> bool:
+        return self._conn.execute("SELECT 1 FROM reports LIMIT 1").fetchone() is not None
+
+    def has_key_results(self) -> bool:
+        return self._conn.execute("SELECT 1 FROM key_results LIMIT 1").fetchone() is not None
+
+    def pending_key_results(self) -> list[tuple[str, str, str]]:
+        """``(role, key result, status)`` for every key result not ACHIEVED."""
+        # The literal must match the partial index predicate for SQLite to use it.
+        return self._conn.execute(
+            "SELECT role, name, status FROM key_results WHERE status != 'ACHIEVED' ORDER BY role, name"
+        ).fetchall()
+
+    def role_status(self, role: str) -> Report | None:
+        """The latest report for ``role``."""
+        row = self._conn.execute(
+            "SELECT id, role, state, status, timestamp, notes FROM reports WHERE role = ? ORDER BY id DESC LIMIT 1",
+            (role,),
+        ).fetchone()
+        return self._report(row) if row else None
+
+    def reports(self) -> list[Report]:
+        rows = self._conn.execute("SELECT id, role, state, status, timestamp, notes FROM reports ORDER BY id")
+        return [self._report(row) for row in rows.fetchall()]
+
+    def _report(self, row) -> Report:
+        report_id, role, state, status, timestamp, notes = row
+        key_results = self._conn.execute(
+            "SELECT name, status FROM report_key_results WHERE report_id = ? ORDER BY position", (report_id,)
+        ).fetchall()
+        return Report(role, state, status, timestamp, notes, key_results, report_id)
+
+    def render_markdown(self) -> str:
+        """Render the store in the shared.md format described in the README."""
+        parts = ["# Shared Results\n"]
+        for report in self.reports():
+            lines = [
+                f"## AGENT STATUS: {report.role} - {report.state}",
+                f"**Timestamp**: {report.timestamp}",
+                f"**Status**: {report.status}",
+            ]
+            if report.key_results:
+                lines += ["", "### Key Results:"]
+                lines += [f"{i}. [{name}]: {status}" for i, (name, status) in enumerate(report.key_results, 1)]
+            if report.notes:
+                lines += ["", report.notes.rstrip()]
+            parts.append("\n".join(lines) + "\n")
+        row = self._conn.execute("SELECT value FROM workflow WHERE key = 'completed_at'").fetchone()
+        if row:
+            parts.append(f"## WORKFLOW STATUS: COMPLETED\n**Timestamp**: {row[0]}\n")
+        return "\n".join(parts)
+
+    def render_shared(self, path: str | Path | None = None, force: bool = False) -> Path:
+        """Write the markdown view, by default to shared.md next to the database.
+
+        Reports appended to shared.md since the last render are imported
+        first. Raises SharedMarkdownError instead of overwriting markdown it
+        cannot import, unless ``force`` is set.
+        """
+        shared = self.path.with_name("shared.md")
+        path = Path(path) if path else shared
+        if path.resolve() != shared.resolve():
+            atomic_write(path, self.render_markdown())
+            return path
+
+        def statements(conn: sqlite3.Connection) -> None:
+            # Runs under the write lock, so concurrent renders import each report once.
+            signature = _signature(path)
+            try:
+                before = path.read_bytes()
+            except FileNotFoundError:
+                before = b""
+            size, sha = self.rendered_view()
+            start = size if size and hashlib.sha256(before[:size]).hexdigest() == sha else 0
+            if size and not start and not force:
+                raise SharedMarkdownError(f"{path} was edited since it was last rendered; use --force to overwrite it")
+            if not force:
+                reports, completed, stray = parse_markdown(before[start:].decode("utf-8", errors="replace"))
+                if stray:
+                    raise SharedMarkdownError(
+                        f"{path} has markdown outside any AGENT STATUS block, e.g. {stray[0].strip()!r}; "
+                        "record it with 'results_store.py record' or use --force to overwrite it"
+                    )
+                for report in reports:
+                    _insert_report(conn, report)
+                if completed:
+                    conn.execute("INSERT OR IGNORE INTO workflow (key, value) VALUES ('completed_at', ?)", (_now(),))
+            data = self.render_markdown().encode("utf-8")
+            if _signature(path) != signature:
+                raise SharedMarkdownError(f"{path} changed while rendering; try again")
+            atomic_write(path, data)
+            conn.executemany(
+                "INSERT OR REPLACE INTO workflow (key, value) VALUES (?, ?)",
+                [(RENDERED_SIZE_KEY, str(len(data))), (RENDERED_SHA_KEY, hashlib.sha256(data).hexdigest())],
+            )
+
+        self._write(statements)
+        return path
+
+
+def _parse_kr(value: str) -> tuple[str, str]:
+    name, sep, status = value.rpartition("=")
+    if not sep or not name.strip() or not status.strip():
+        raise argparse.ArgumentTypeError(f"expected '<key result>=<STATUS>', got {value!r}")
+    return name, status
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Record and query workflow results.")
+    parser.add_argument("--db", type=Path, default=None, help="database path (default: results/results.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    record = sub.add_parser("record", help="record an AGENT STATUS report")
+    record.add_argument("--role", required=True)
+    record.add_argument("--state", default="COMPLETED", help="heading state, e.g. COMPLETED (default)")
+    record.add_argument("--status", default="completed", choices=["completed", "blocked", "partial"])
+    record.add_argument("--kr", action="append", type=_parse_kr, default=[], metavar="NAME=STATUS")
+    record.add_argument("--notes", default="")
+
+    complete = sub.add_parser("complete", help="mark the workflow as COMPLETED")
+    sub.add_parser("reset", help="clear all records before a new workflow run")
+    sub.add_parser("pending", help="list key results not ACHIEVED")
+    status = sub.add_parser("status", help="show the latest report for a role")
+    status.add_argument("role")
+    render = sub.add_parser("render", help="write shared.md from the store")
+    render.add_argument("--output", type=Path, default=None)
+    for command in (complete, render):
+        command.add_argument("--force", action="store_true",
+                             help="overwrite shared.md even if it has markdown the store cannot import")
+
+    args = parser.parse_args(argv)
+    db_path = args.db or default_db_path()
+    if args.command in ("pending", "status", "reset") and not db_path.exists():
+        # Nothing recorded yet; leave the store uncreated.
+        if args.command == "status":
+            print(f"no report for role {args.role!r}", file=sys.stderr)
+            return 1
+        return 0
+    try:
+        with ResultsStore(db_path, readonly=args.command in ("pending", "status")) as store:
+            if args.command == "record":
+                store.record(args.role, args.state, args.status, args.kr, args.notes)
+            elif args.command == "complete":
+                store.mark_workflow_completed()
+                store.render_shared(force=args.force)
+            elif args.command == "reset":
+                store.reset()
+            elif args.command == "pending":
+                for role, name, kr_status in store.pending_key_results():
+                    print(f"{role}: {name} ({kr_status})")
+            elif args.command == "status":
+                report = store.role_status(args.role)
+                if report is None:
+                    print(f"no report for role {args.role!r}", file=sys.stderr)
+                    return 1
+                print(f"{report.role} - {report.state} ({report.status}) at {report.timestamp}")
+                for name, kr_status in report.key_results:
+                    print(f"  {name}: {kr_status}")
+            elif args.command == "render":
+                print(store.render_shared(args.output, force=args.force))
+    except SharedMarkdownError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
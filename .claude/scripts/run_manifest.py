@@ -0,0 +1,229 @@
+"""Run manifest for incremental and resumable workflow execution.
+
+After each role finishes, the scheduler checkpoints a fingerprint for it in
+``results/.runs/<workflow>.json``. The fingerprint covers:
+
+- the role's YAML block (minus ``estimated_minutes``, which only affects ordering)
+- the content of every input that names an existing file or directory in
+  the project, e.g. ``templates/cv.docx`` or ``results/brief.md``
+- the fingerprints and recorded outputs of the roles it depends on
+
+The manifest also stores the hash of each output that names a file the role
+produced. On the next run a role is skipped when its fingerprint is unchanged
+and its recorded outputs are still on disk, unmodified. Because fingerprints
+include upstream fingerprints, editing one role re-runs that role and
+everything downstream of it, and nothing else.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import json
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from project import atomic_write, project_root
+from workflow_model import Role, Workflow
+
+MANIFEST_VERSION = 1
+# Files the tooling rewrites while a workflow runs (see .gitignore). They are
+# left out of directory hashes, or a role reading e.g. ``results/`` would
+# never be up to date.
+RUNTIME_PATTERNS = (
+    "results/.runs/*",
+    "results/results.db*",
+    "results/trace.jsonl",
+    "results/.shared.md.okr-index.json",
+    ".claude/cache/*",
+    "*.tmp",
+)
+
+
+def default_manifest_path(workflow_path: str | Path) -> Path:
+    return project_root() / "results" / ".runs" / f"{Path(workflow_path).stem}.json"
+
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def is_runtime_file(path: Path, root: Path) -> bool:
+    try:
+        rel = path.relative_to(root).as_posix()
+    except ValueError:
+        return False
+    return any(fnmatch.fnmatchcase(rel, pattern) for pattern in RUNTIME_PATTERNS)
+
+
+def hash_path(path: Path, root: Path | None = None) -> str | None:
+    """SHA-256 of a file, or of every file under a directory; None if missing.
+
+    With ``root``, runtime files under a directory are skipped.
+    """
+    if path.is_file():
+        digest = hashlib.sha256()
+        with open(path, "rb") as fh:
+            while chunk := fh.read(1 << 20):
+                digest.update(chunk)
+        return digest.hexdigest()
+    if path.is_dir():
+        digest = hashlib.sha256()
+        for file in sorted(p for p in path.rglob("*") if p.is_file()):
+            if root is not None and is_runtime_file(file, root):
+                continue
+            digest.update(f"{file.relative_to(path).as_posix()}\0{hash_path(file)}\n".encode())
+        return digest.hexdigest()
+    return None
+
+
+def artifact_path(item: str, root: Path) -> Path | None:
+    """The project path an input/output item names, if it is one."""
+    text = item.strip()
+    if not text or "\n" in text:
+        return None
+    try:
+        path = (root / text).resolve()
+    except (OSError, ValueError):
+        return None
+    if path != root and root not in path.parents:
+        return None
+    return path
+
+
+def hash_artifacts(items: list[str], root: Path) -> dict[str, str]:
+    hashes = {}
+    for item in items:
+        path = artifact_path(item, root)
+        if path is not None:
+            digest = hash_path(path, root)
+            if digest is not None:
+                hashes[item.strip()] = digest
+    return hashes
+
+
+def definition_hash(role: Role) -> str:
+    block = role.model_dump(mode="json", exclude={"estimated_minutes"})
+    return hashlib.sha256(json.dumps(block, sort_keys=True).encode()).hexdigest()
+
+
+class ResumeError(RuntimeError):
+    """--resume was requested but there is no interrupted run to resume."""
+
+
+class RunManifest:
+    def __init__(self, path: Path):
+        self.path = path
+        self.data = self._load()
+
+    def _load(self) -> dict:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = None
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            data = {"version": MANIFEST_VERSION, "run_id": None, "status": None, "roles": {}}
+        return data
+
+    @property
+    def roles(self) -> dict[str, dict]:
+        return self.data["roles"]
+
+    def save(self) -> None:
+        atomic_write(self.path, json.dumps(self.data, indent=1, sort_keys=True))
+
+
+class IncrementalRun:
+    """Decides which roles to skip and checkpoints the ones that finish."""
+
+    def __init__(
+        self,
+        workflow: Workflow,
+        deps: dict[str, set[str]],
+        manifest: RunManifest,
+        root: Path | None = None,
+        force: bool = False,
+    ):
+        self.roles = {role.role: role for role in workflow.people_involved}
+        self.deps = deps
+        self.manifest = manifest
+        self.root = (root or project_root()).resolve()
+        self.force = force
+        self._keys: dict[str, str] = {}
+        self.skipped: list[str] = []
+        self.executed: list[str] = []
+
+    def begin(self, workflow_path: str | Path, resume: bool = False) -> None:
+        data = self.manifest.data
+        if resume:
+            if data.get("status") not in ("running", "failed"):
+                raise ResumeError(f"no interrupted run recorded in {self.manifest.path}")
+        else:
+            data["run_id"] = uuid.uuid4().hex[:12]
+            data["started"] = _now()
+        data["workflow"] = str(workflow_path)
+        data["status"] = "running"
+        data.pop("finished", None)
+        for name in list(self.manifest.roles):
+            if name not in self.roles:
+                del self.manifest.roles[name]
+        self.manifest.save()
+
+    def fingerprint(self, name: str) -> str:
+        """Fingerprint of ``name``; call only once its dependencies have finished."""
+        role = self.roles[name]
+        parts = {
+            "definition": definition_hash(role),
+            "inputs": hash_artifacts(role.inputs, self.root),
+            "upstream": {
+                dep: [self.manifest.roles.get(dep, {}).get("key"), self.manifest.roles.get(dep, {}).get("outputs")]
+                for dep in sorted(self.deps.get(name, ()))
+            },
+        }
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+    def _outputs_intact(self, entry: dict) -> bool:
+        for item, digest in entry.get("outputs", {}).items():
+            path = artifact_path(item, self.root)
+            if path is None or hash_path(path, self.root) != digest:
+                return False
+        return True
+
+    def should_skip(self, name: str) -> bool:
+        key = self._keys[name] = self.fingerprint(name)
+        entry = self.manifest.roles.get(name)
+        up_to_date = (
+            not self.force
+            and entry is not None
+            and entry.get("status") == "done"
+            and entry.get("key") == key
+            and self._outputs_intact(entry)
+        )
+        if up_to_date:
+            self.skipped.append(name)
+        return up_to_date
+
+    def on_event(self, event: str, name: str) -> None:
+        roles = self.manifest.roles
+        if event == "start":
+            self.executed.append(name)
+            roles[name] = {"status": "running", "key": self._keys.get(name), "started": _now()}
+        elif event == "done":
+            role = self.roles[name]
+            roles[name] = {
+                "status": "done",
+                "key": self._keys.get(name),
+                "outputs": hash_artifacts(role.outputs, self.root),
+                "finished": _now(),
+            }
+        elif event == "failed":
+            roles.pop(name, None)
+        else:
+            return
+        self.manifest.save()
+
+    def finish(self, ok: bool) -> None:
+        self.manifest.data["status"] = "completed" if ok else "failed"
+        self.manifest.data["finished"] = _now()
+        self.manifest.save()
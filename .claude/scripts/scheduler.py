@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""Dependency-graph scheduler for workflow roles.
+
+Builds a DAG from ``people_involved[*].inputs_outputs`` in a workflow YAML:
+role B depends on role A when one of B's inputs is one of A's outputs
+(compared case- and whitespace-insensitively). Inputs that no role produces
+are external and treated as already available.
+
+Roles are dispatched as soon as every producer of their inputs has finished,
+at most ``--workers`` at a time. When more roles are ready than there are
+free workers, the role with the longest remaining critical path goes first.
+
+A role's duration estimate comes from an optional ``estimated_minutes`` key
+in its YAML block (default 1). Estimates only drive ordering and the dry run.
+
+Runs are incremental: every finished role is checkpointed in a run manifest
+(see run_manifest.py), and roles whose definition, input artifacts and
+upstream roles are unchanged are skipped. ``--resume`` continues a run that
+crashed or failed; ``--force`` re-runs every role.
+
+    python .claude/scripts/scheduler.py workflows/my-workflow.yaml --dry-run --workers 3
+    python .claude/scripts/scheduler.py workflows/my-workflow.yaml --command 'claude -p @{role}'
+    python .claude/scripts/scheduler.py workflows/my-workflow.yaml --command '...' --resume
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import shlex
+import subprocess
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+import pydantic
+import yaml
+
+from run_manifest import IncrementalRun, ResumeError, RunManifest, default_manifest_path
+from tracing import count, span
+from workflow_model import Role, Workflow, load_workflow
+
+DEFAULT_ESTIMATE = 1.0
+
+
+class CycleError(ValueError):
+    """The workflow's inputs/outputs form a dependency cycle."""
+
+    def __init__(self, roles: list[str]):
+        self.roles = roles
+        super().__init__("dependency cycle between roles: " + " -> ".join(roles))
+
+
+@dataclass
+class RoleNode:
+    name: str
+    inputs: list[str] = field(default_factory=list)
+    outputs: list[str] = field(default_factory=list)
+    estimate: float = DEFAULT_ESTIMATE
+    deps: set[str] = field(default_factory=set)
+    dependents: set[str] = field(default_factory=set)
+    # Longest estimated path from the start of this role to the end of the workflow.
+    critical_path: float = 0.0
+
+
+def _normalize(item: str) -> str:
+    return " ".join(item.split()).lower()
+
+
+class DependencyGraph:
+    def __init__(self, nodes: dict[str, RoleNode]):
+        self.nodes = nodes
+        self.order = self._topological_order()
+        self._compute_critical_paths()
+
+    @classmethod
+    def from_roles(cls, roles: Iterable[Role]) -> "DependencyGraph":
+        nodes: dict[str, RoleNode] = {}
+        for role in roles:
+            name = role.role.strip()
+            if not name:
+                raise ValueError("every entry in people_involved needs a 'role'")
+            if name in nodes:
+                raise ValueError(f"duplicate role {name!r} in people_involved")
+            estimate = DEFAULT_ESTIMATE if role.estimated_minutes is None else role.estimated_minutes
+            nodes[name] = RoleNode(name, role.inputs, role.outputs, estimate)
+
+        producers: dict[str, set[str]] = {}
+        for node in nodes.values():
+            for item in node.outputs:
+                producers.setdefault(_normalize(item), set()).add(node.name)
+        for node in nodes.values():
+            for item in node.inputs:
+                for producer in producers.get(_normalize(item), ()):
+                    if producer != node.name:
+                        node.deps.add(producer)
+                        nodes[producer].dependents.add(node.name)
+        return cls(nodes)
+
+    @classmethod
+    def from_workflow(cls, workflow: Workflow) -> "DependencyGraph":
+        with span("graph.build", roles=len(workflow.people_involved)):
+            return cls.from_roles(workflow.people_involved)
+
+    def external_inputs(self) -> dict[str, list[str]]:
+        """Inputs per role that no role in the workflow produces."""
+        produced = {_normalize(o) for node in self.nodes.values() for o in node.outputs}
+        external = {}
+        for node in self.nodes.values():
+            missing = [i for i in node.inputs if _normalize(i) not in produced]
+            if missing:
+                external[node.name] = missing
+        return external
+
+    def _topological_order(self) -> list[str]:
+        indegree = {name: len(node.deps) for name, node in self.nodes.items()}
+        ready = sorted(name for name, degree in indegree.items() if degree == 0)
+        order: list[str] = []
+        while ready:
+            name = ready.pop()
+            order.append(name)
+            for child in sorted(self.nodes[name].dependents):
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+        if len(order) != len(self.nodes):
+            raise CycleError(self._find_cycle({n for n, d in indegree.items() if d > 0}))
+        return order
+
+    def _find_cycle(self, remaining: set[str]) -> list[str]:
+        # Every remaining node has a remaining dependency, so walking deps must loop.
+        path: list[str] = []
+        seen: dict[str, int] = {}
+        name = min(remaining)
+        while name not in seen:
+            seen[name] = len(path)
+            path.append(name)
+            name = min(d for d in self.nodes[name].deps if d in remaining)
+        return path[seen[name]:] + [name]
+
+    def _compute_critical_paths(self) -> None:
+        for name in reversed(self.order):
+            node = self.nodes[name]
+            tail = max((self.nodes[c].critical_path for c in node.dependents), default=0.0)
+            node.critical_path = node.estimate + tail
+
+    def priority(self, name: str) -> tuple[float, str]:
+        """Heap key: longest remaining critical path first, then by name."""
+        return (-self.nodes[name].critical_path, name)
+
+
+@dataclass
+class PlannedRole:
+    role: str
+    start: float
+    finish: float
+    worker: int
+
+
+def plan(graph: DependencyGraph, workers: int) -> list[PlannedRole]:
+    """Simulate the scheduler with the duration estimates and return the timeline."""
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    remaining = {name: len(node.deps) for name, node in graph.nodes.items()}
+    ready = [graph.priority(n) for n, d in remaining.items() if d == 0]
+    heapq.heapify(ready)
+    free_workers = list(range(workers))
+    running: list[tuple[float, int, str]] = []  # (finish, worker, role)
+    timeline: list[PlannedRole] = []
+    now = 0.0
+    while ready or running:
+        while ready and free_workers:
+            _, name = heapq.heappop(ready)
+            worker = free_workers.pop(0)
+            finish = now + graph.nodes[name].estimate
+            heapq.heappush(running, (finish, worker, name))
+            timeline.append(PlannedRole(name, now, finish, worker))
+        now, worker, name = heapq.heappop(running)
+        finished = [(worker, name)]
+        while running and running[0][0] == now:
+            _, w, n = heapq.heappop(running)
+            finished.append((w, n))
+        for worker, name in finished:
+            free_workers.append(worker)
+            for child in graph.nodes[name].dependents:
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    heapq.heappush(ready, graph.priority(child))
+        free_workers.sort()
+    return timeline
+
+
+def format_plan(graph: DependencyGraph, timeline: list[PlannedRole], workers: int) -> str:
+    lines = [f"Planned schedule for {len(graph.nodes)} roles on {workers} worker(s):", ""]
+    waves: dict[float, list[PlannedRole]] = {}
+    for entry in timeline:
+        waves.setdefault(entry.start, []).append(entry)
+    for i, start in enumerate(sorted(waves), 1):
+        roles = ", ".join(
+            f"{e.role} (cp={graph.nodes[e.role].critical_path:g})" for e in waves[start]
+        )
+        lines.append(f"Wave {i} @ t={start:g}: {roles}")
+    makespan = max((e.finish for e in timeline), default=0.0)
+    critical = max((n.critical_path for n in graph.nodes.values()), default=0.0)
+    total = sum(n.estimate for n in graph.nodes.values())
+    lines += [
+        "",
+        f"Estimated makespan: {makespan:g} min "
+        f"(critical path {critical:g}, serial {total:g})",
+    ]
+    external = graph.external_inputs()
+    if external:
+        lines += ["", "External inputs (not produced by any role):"]
+        lines += [f"  {role}: {', '.join(items)}" for role, items in sorted(external.items())]
+    return "\n".join(lines)
+
+
+def run(
+    graph: DependencyGraph,
+    run_role: Callable[[str], object],
+    workers: int,
+    on_event: Callable[[str, str], None] | None = None,
+    skip: Callable[[str], bool] | None = None,
+) -> dict[str, object]:
+    """Execute ``run_role`` for every role respecting dependencies.
+
+    ``skip`` is asked about each role once its dependencies are done; a
+    skipped role counts as finished without running. Returns role -> result
+    for the roles that ran. If a role raises, no new roles are dispatched,
+    running roles are allowed to finish and the first exception is re-raised.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    def notify(event: str, name: str) -> None:
+        count(f"role.{event}", role=name)
+        if on_event is not None:
+            on_event(event, name)
+
+    remaining = {name: len(node.deps) for name, node in graph.nodes.items()}
+    ready = [graph.priority(n) for n, d in remaining.items() if d == 0]
+    heapq.heapify(ready)
+    results: dict[str, object] = {}
+    failure: BaseException | None = None
+
+    def release(name: str) -> None:
+        for child in graph.nodes[name].dependents:
+            remaining[child] -= 1
+            if remaining[child] == 0:
+                heapq.heappush(ready, graph.priority(child))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running: dict[Future, str] = {}
+        while ready or running:
+            while ready and len(running) < workers and failure is None:
+                _, name = heapq.heappop(ready)
+                if skip is not None and skip(name):
+                    notify("skipped", name)
+                    release(name)
+                    continue
+                notify("start", name)
+                running[pool.submit(_traced_run, run_role, name, sorted(graph.nodes[name].deps))] = name
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    result = future.result()
+                except BaseException as exc:  # noqa: BLE001 - re-raised below
+                    notify("failed", name)
+                    failure = failure or exc
+                    continue
+                notify("done", name)
+                results[name] = result
+                release(name)
+    if failure is not None:
+        raise failure
+    return results
+
+
+def _traced_run(run_role: Callable[[str], object], name: str, deps: list[str]) -> object:
+    with span("role.run", role=name, deps=deps):
+        return run_role(name)
+
+
+def shell_runner(command: str) -> Callable[[str], int]:
+    def run_role(role: str) -> int:
+        # Plain substitution: other braces in the command (awk, shell) are left alone.
+        subprocess.run(command.replace("{role}", shlex.quote(role)), shell=True, check=True)
+        return 0
+
+    return run_role
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workflow", type=Path, help="workflow YAML file")
+    parser.add_argument("--workers", type=int, default=4, help="maximum roles running at once (default: 4)")
+    parser.add_argument("--dry-run", action="store_true", help="print planned waves and estimated makespan")
+    parser.add_argument("--command", help="shell command run per role; '{role}' is replaced by the shell-quoted role name "
+                        "(leave it unquoted in the command)")
+    parser.add_argument("--resume", action="store_true", help="continue the last interrupted run")
+    parser.add_argument("--force", action="store_true", help="re-run every role, ignoring the run manifest")
+    parser.add_argument("--manifest", type=Path, default=None, help="run manifest (default: results/.runs/<workflow>.json)")
+    args = parser.parse_args(argv)
+    if args.resume and args.force:
+        parser.error("--resume and --force are mutually exclusive")
+
+    try:
+        workflow = load_workflow(args.workflow)
+        graph = DependencyGraph.from_workflow(workflow)
+    except (OSError, yaml.YAMLError, pydantic.ValidationError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    if args.dry_run or not args.command:
+        print(format_plan(graph, plan(graph, args.workers), args.workers))
+        return 0
+
+    manifest = RunManifest(args.manifest or default_manifest_path(args.workflow))
+    incremental = IncrementalRun(
+        workflow, {name: node.deps for name, node in graph.nodes.items()}, manifest, force=args.force
+    )
+    try:
+        incremental.begin(args.workflow, resume=args.resume)
+    except ResumeError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    def log(event: str, role: str) -> None:
+        incremental.on_event(event, role)
+        print(f"[{event}] {role}", flush=True)
+
+    try:
+        run(graph, shell_runner(args.command), args.workers, on_event=log, skip=incremental.should_skip)
+    except subprocess.CalledProcessError as exc:
+        incremental.finish(ok=False)
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    incremental.finish(ok=True)
+    print(f"{len(incremental.executed)} role(s) run, {len(incremental.skipped)} up to date")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
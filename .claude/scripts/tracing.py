@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""Spans and counters for workflow runs, plus a report over the trace.
+
+Tracing is off unless ``AICOMPANY_TRACE`` is set: ``1`` writes to
+``results/trace.jsonl``, any other value is used as the trace path. When
+off, ``span()`` returns a shared no-op object and ``count()`` returns
+immediately, so instrumented code pays one global lookup per call.
+
+Instrumented code:
+
+    from tracing import span, count
+
+    with span("workflow.load", path=str(path)) as s:
+        workflow = ...
+        s.set(roles=len(workflow.people_involved))
+    count("okr.pending", len(pending))
+
+Each finished span or counter is one JSON line, appended with a single
+``write`` so concurrent processes (agents, stop hooks, CV workers) can
+share a trace file.
+
+    python .claude/scripts/tracing.py report [results/trace.jsonl] --top 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+from project import project_root
+
+ENV_VAR = "AICOMPANY_TRACE"
+
+
+def default_trace_path() -> Path:
+    return project_root() / "results" / "trace.jsonl"
+
+
+class _Writer:
+    def __init__(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def write(self, event: dict) -> None:
+        os.write(self._fd, (json.dumps(event, default=str) + "\n").encode())
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+_writer: _Writer | None = None
+_current_span: contextvars.ContextVar[str | None] = contextvars.ContextVar("current_span", default=None)
+_ids = iter(range(1, sys.maxsize))
+_ids_lock = threading.Lock()
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "role", "attrs", "id", "parent", "start", "_t0", "_token")
+
+    def __init__(self, name: str, role: str | None, attrs: dict):
+        self.name = name
+        self.role = role
+        self.attrs = attrs
+
+    def __enter__(self) -> "_Span":
+        with _ids_lock:
+            self.id = f"{os.getpid()}-{next(_ids)}"
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self.id)
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        duration = time.perf_counter() - self._t0
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        writer = _writer
+        if writer is not None:
+            writer.write({
+                "type": "span",
+                "name": self.name,
+                "role": self.role,
+                "id": self.id,
+                "parent": self.parent,
+                "pid": os.getpid(),
+                "start": self.start,
+                "duration": duration,
+                "attrs": self.attrs,
+            })
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+
+def span(name: str, role: str | None = None, **attrs):
+    """Time a block of code. Use as ``with span("name", role=..., key=value) as s:``."""
+    if _writer is None:
+        return _NULL_SPAN
+    return _Span(name, role, attrs)
+
+
+def count(name: str, value: float = 1, role: str | None = None, **attrs) -> None:
+    """Record a counter increment."""
+    writer = _writer
+    if writer is None:
+        return
+    writer.write({
+        "type": "counter",
+        "name": name,
+        "role": role,
+        "parent": _current_span.get(),
+        "pid": os.getpid(),
+        "time": time.time(),
+        "value": value,
+        "attrs": attrs,
+    })
+
+
+def enabled() -> bool:
+    return _writer is not None
+
+
+def enable(path: str | Path | None = None) -> Path:
+    """Start writing events to ``path`` (default: results/trace.jsonl)."""
+    global _writer
+    disable()
+    _writer = _Writer(Path(path) if path else default_trace_path())
+    return _writer.path
+
+
+def disable() -> None:
+    global _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None
+
+
+def _enable_from_env() -> None:
+    value = os.environ.get(ENV_VAR, "").strip()
+    if value and value.lower() not in ("0", "false", "no", "off"):
+        enable(None if value.lower() in ("1", "true", "yes", "on") else value)
+
+
+_enable_from_env()
+
+
+# --- report -------------------------------------------------------------------
+
+
+def load_events(path: str | Path) -> list[dict]:
+    events = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue  # a line cut short by a crash
+    return events
+
+
+def _bar(start: float, end: float, t0: float, total: float, width: int) -> str:
+    if total <= 0:
+        return "#" * width
+    left = int((start - t0) / total * width)
+    right = max(left + 1, int((end - t0) / total * width))
+    return " " * left + "#" * (right - left) + " " * (width - right)
+
+
+def role_timeline(spans: list[dict], width: int = 50) -> list[str]:
+    by_role: dict[str, list[dict]] = {}
+    for s in spans:
+        if s.get("role"):
+            by_role.setdefault(s["role"], []).append(s)
+    if not by_role:
+        return ["(no spans carry a role)"]
+    t0 = min(s["start"] for s in spans)
+    t1 = max(s["start"] + s["duration"] for s in spans)
+    total = t1 - t0
+    rows = []
+    name_width = max(len(r) for r in by_role)
+    for role, items in sorted(by_role.items(), key=lambda kv: min(s["start"] for s in kv[1])):
+        start = min(s["start"] for s in items)
+        end = max(s["start"] + s["duration"] for s in items)
+        rows.append(f"{role:<{name_width}} |{_bar(start, end, t0, total, width)}| "
+                    f"{start - t0:7.2f}s +{end - start:.2f}s")
+    return rows
+
+
+def critical_path(spans: list[dict]) -> list[dict]:
+    """Walk back from the last role to finish through its latest-finishing dependency."""
+    runs = {s["role"]: s for s in spans if s["name"] == "role.run" and s.get("role")}
+    if not runs:
+        return []
+    end = lambda s: s["start"] + s["duration"]  # noqa: E731
+    path = [max(runs.values(), key=end)]
+    while True:
+        deps = [runs[d] for d in path[-1]["attrs"].get("deps", []) if d in runs]
+        if not deps:
+            break
+        path.append(max(deps, key=end))
+    return list(reversed(path))
+
+
+def format_report(events: list[dict], top: int = 10) -> str:
+    spans = [e for e in events if e.get("type") == "span"]
+    counters = [e for e in events if e.get("type") == "counter"]
+    if not spans and not counters:
+        return "trace is empty"
+    lines = []
+    if spans:
+        t0 = min(s["start"] for s in spans)
+        t1 = max(s["start"] + s["duration"] for s in spans)
+        lines += [f"Trace: {len(spans)} spans, {len(counters)} counters, {t1 - t0:.2f}s wall", ""]
+        lines += ["Per-role timeline:"] + ["  " + row for row in role_timeline(spans)] + [""]
+
+        path = critical_path(spans)
+        if path:
+            lines.append("Critical path (role.run):")
+            for s in path:
+                lines.append(f"  {s['duration']:8.2f}s  {s['role']}")
+            lines += [f"  {sum(s['duration'] for s in path):8.2f}s  total", ""]
+
+        totals: dict[str, list[float]] = {}
+        for s in spans:
+            totals.setdefault(s["name"], []).append(s["duration"])
+        lines.append("By step:")
+        lines.append(f"  {'total':>9} {'count':>6} {'mean':>9} {'max':>9}  name")
+        for name, durations in sorted(totals.items(), key=lambda kv: -sum(kv[1])):
+            lines.append(f"  {sum(durations):8.3f}s {len(durations):>6} {sum(durations) / len(durations):8.4f}s "
+                         f"{max(durations):8.3f}s  {name}")
+        lines.append("")
+
+        lines.append(f"Top {top} slowest steps:")
+        for s in sorted(spans, key=lambda s: -s["duration"])[:top]:
+            role = f" [{s['role']}]" if s.get("role") else ""
+            attrs = {k: v for k, v in s.get("attrs", {}).items() if k != "deps"}
+            detail = f" {json.dumps(attrs, default=str)}" if attrs else ""
+            lines.append(f"  {s['duration']:8.3f}s  {s['name']}{role}{detail}")
+    if counters:
+        sums: dict[str, float] = {}
+        for c in counters:
+            sums[c["name"]] = sums.get(c["name"], 0) + c["value"]
+        lines += ["", "Counters:"] + [f"  {value:>10g}  {name}" for name, value in sorted(sums.items())]
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarise a workflow trace.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("report", help="per-role timeline, critical path and slowest steps")
+    report.add_argument("trace", nargs="?", type=Path, default=None, help="trace file (default: results/trace.jsonl)")
+    report.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    path = args.trace or default_trace_path()
+    try:
+        events = load_events(path)
+    except OSError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    print(format_report(events, args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
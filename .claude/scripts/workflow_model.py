@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Typed model and cached loader for workflow YAML files.
+
+``Workflow`` mirrors ``workflows/workflow-template.yaml``. ``load_workflow``
+parses with libyaml's C loader when PyYAML was built with it, validates
+once, and pickles the validated model under ``.claude/cache/workflows/``
+keyed by the SHA-256 of the file content. Later loads of the same file
+version unpickle the model and skip both parsing and validation.
+
+    python .claude/scripts/workflow_model.py workflows/my-workflow.yaml
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import pickle
+import sys
+from pathlib import Path
+from typing import Any
+
+import pydantic
+import yaml
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from project import atomic_write, project_root
+from tracing import count, span
+
+# Bump when the models change so stale pickles are not reused.
+SCHEMA_VERSION = 3
+
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def default_cache_dir() -> Path:
+    return project_root() / ".claude" / "cache" / "workflows"
+
+
+class _Model(BaseModel):
+    # Workflows are hand-written; keep unknown keys rather than rejecting them.
+    model_config = ConfigDict(extra="allow")
+
+
+class Tool(_Model):
+    name: str
+    purpose: str = ""
+
+
+class Skill(_Model):
+    name: str
+    purpose: str = ""
+
+
+class KnowledgeSource(_Model):
+    name: str
+    purpose: str = ""
+    path: str = ""
+
+
+class InputsOutputs(_Model):
+    inputs: list[str] = Field(default_factory=list)
+    outputs: list[str] = Field(default_factory=list)
+
+    @field_validator("inputs", "outputs", mode="before")
+    @classmethod
+    def _to_list(cls, value: Any) -> Any:
+        if value is None:
+            return []
+        if isinstance(value, (str, int, float)):
+            return [str(value)]
+        return value
+
+
+class Precondition(_Model):
+    name: str
+    description: str = ""
+    verification: str = ""
+    # Files or directories the verification reads; used to skip re-checking unchanged gates.
+    depends_on: list[str] = Field(default_factory=list)
+    timeout: float | None = None
+
+    @field_validator("depends_on", mode="before")
+    @classmethod
+    def _to_list(cls, value: Any) -> Any:
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [value]
+        return value
+
+
+class KeyResult(_Model):
+    result: str
+    validation: list[str] = Field(default_factory=list)
+
+    @field_validator("validation", mode="before")
+    @classmethod
+    def _to_list(cls, value: Any) -> Any:
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [value]
+        return value
+
+
+class OKR(_Model):
+    objectives: list[str] = Field(default_factory=list)
+    key_results: list[KeyResult] = Field(default_factory=list)
+
+
+class Role(_Model):
+    role: str
+    description: str = ""
+    tools: list[Tool] = Field(default_factory=list)
+    skills: list[Skill] = Field(default_factory=list)
+    knowledge_sources: list[KnowledgeSource] = Field(default_factory=list)
+    inputs_outputs: list[InputsOutputs] = Field(default_factory=list)
+    preconditions: list[Precondition] = Field(default_factory=list)
+    okr: OKR = Field(default_factory=OKR)
+    estimated_minutes: float | None = Field(default=None, ge=0)
+
+    @field_validator("tools", "skills", "knowledge_sources", "inputs_outputs", "preconditions", mode="before")
+    @classmethod
+    def _none_to_list(cls, value: Any) -> Any:
+        if value is None:
+            return []
+        if isinstance(value, dict):
+            return [value]
+        return value
+
+    @property
+    def inputs(self) -> list[str]:
+        return [item for entry in self.inputs_outputs for item in entry.inputs]
+
+    @property
+    def outputs(self) -> list[str]:
+        return [item for entry in self.inputs_outputs for item in entry.outputs]
+
+
+class Workflow(_Model):
+    name: str
+    overview: str = ""
+    people_involved: list[Role] = Field(default_factory=list)
+
+    @field_validator("people_involved", mode="before")
+    @classmethod
+    def _none_to_list(cls, value: Any) -> Any:
+        return [] if value is None else value
+
+
+def _cache_key(content: bytes) -> str:
+    digest = hashlib.sha256(content)
+    digest.update(f"\0schema={SCHEMA_VERSION}\0pydantic={pydantic.VERSION}".encode())
+    return digest.hexdigest()
+
+
+def parse_workflow(content: bytes | str) -> Workflow:
+    """Parse and validate workflow YAML without touching the cache."""
+    data = yaml.load(content, Loader=YamlLoader) or {}
+    return Workflow.model_validate(data)
+
+
+def load_workflow(path: str | Path, cache_dir: Path | None = None, use_cache: bool = True) -> Workflow:
+    """Load a workflow file, reusing the validated model for unchanged content."""
+    with span("workflow.load", path=str(path)) as s:
+        workflow, cache_state = _load_workflow(Path(path), cache_dir, use_cache)
+        s.set(cache=cache_state, roles=len(workflow.people_involved))
+        count(f"workflow.cache_{cache_state}")
+    return workflow
+
+
+def _load_workflow(path: Path, cache_dir: Path | None, use_cache: bool) -> tuple[Workflow, str]:
+    content = path.read_bytes()
+    if not use_cache:
+        return parse_workflow(content), "off"
+
+    cache_dir = cache_dir or default_cache_dir()
+    cache_file = cache_dir / f"{_cache_key(content)}.pickle"
+    try:
+        with open(cache_file, "rb") as fh:
+            workflow = pickle.load(fh)
+        if isinstance(workflow, Workflow):
+            return workflow, "hit"
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        pass
+
+    workflow = parse_workflow(content)
+    try:
+        atomic_write(cache_file, pickle.dumps(workflow, protocol=pickle.HIGHEST_PROTOCOL))
+    except OSError:
+        pass  # A read-only checkout still loads, just without caching.
+    return workflow, "miss"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate a workflow YAML file against the template schema.")
+    parser.add_argument("workflow", type=Path)
+    parser.add_argument("--no-cache", action="store_true", help="always parse and validate from scratch")
+    args = parser.parse_args(argv)
+
+    try:
+        workflow = load_workflow(args.workflow, use_cache=not args.no_cache)
+    except (OSError, yaml.YAMLError, pydantic.ValidationError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    key_results = sum(len(role.okr.key_results) for role in workflow.people_involved)
+    print(f"{workflow.name}: {len(workflow.people_involved)} roles, {key_results} key results")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())